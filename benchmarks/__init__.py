@@ -0,0 +1,4 @@
+"""
+Benchmarks for the Morris Variant engine; run each one with
+`python3 -m benchmarks.<name>` from the repository root.
+"""
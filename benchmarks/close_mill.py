@@ -0,0 +1,178 @@
+"""
+Micro-benchmark of close_mill(): the handout's match statement against the
+table-driven versions in morris/mills.py.
+
+    python3 -m benchmarks.close_mill [--calls N]
+
+Every implementation is called on the same random positions for every
+occupied point and checked to agree; the report gives the mean cost per call.
+A second table compares finding all removable pieces of a position (what
+generate_remove needs) with one close_mill call per piece against a single
+mill_members() pass over the mill masks.
+"""
+
+import argparse
+import random
+import timeit
+
+from morris.board import from_string
+from morris.mills import close_mill, close_mill_string, mill_members
+
+
+# ---------- Reference implementation (copied from the handout scripts) ----------
+
+def close_mill_match(j, board):
+    """
+    Return True if placing a piece of color C at position j forms a mill.
+    board is a list of length 21 with 'W', 'B', or 'x'.
+    """
+    C = board[j]
+    if C == 'x':  # empty can't close a mill
+        return False
+
+    match j:
+        case 0:
+            return (board[2] == C and board[4] == C) or (board[6] == C and board[18] == C)
+        case 1:
+            return (board[3] == C and board[5] == C) or (board[11] == C and board[20] == C)
+        case 2:
+            return (board[0] == C and board[4] == C) or (board[7] == C and board[15] == C)
+        case 3:
+            return (board[1] == C and board[5] == C) or (board[10] == C and board[17] == C)
+        case 4:
+            return (board[0] == C and board[2] == C) or (board[8] == C and board[12] == C)
+        case 5:
+            return (board[1] == C and board[3] == C) or (board[9] == C and board[14] == C)
+        case 6:
+            return (board[0] == C and board[18] == C) or (board[7] == C and board[8] == C)
+        case 7:
+            return (board[6] == C and board[8] == C) or (board[2] == C and board[15] == C)
+        case 8:
+            return (board[6] == C and board[7] == C) or (board[4] == C and board[12] == C)
+        case 9:
+            return (board[5] == C and board[14] == C) or (board[10] == C and board[11] == C)
+        case 10:
+            return (board[3] == C and board[17] == C) or (board[9] == C and board[11] == C)
+        case 11:
+            return (board[9] == C and board[10] == C) or (board[1] == C and board[20] == C)
+        case 12:
+            # extra OR: (15,18)
+            return ((board[4] == C and board[8] == C) or
+                    (board[13] == C and board[14] == C) or
+                    (board[15] == C and board[18] == C))
+        case 13:
+            return (board[12] == C and board[14] == C) or (board[16] == C and board[19] == C)
+        case 14:
+            # extra OR: (17,20)
+            return ((board[5] == C and board[9] == C) or
+                    (board[12] == C and board[13] == C) or
+                    (board[17] == C and board[20] == C))
+        case 15:
+            # extra OR: (12,18)
+            return ((board[2] == C and board[7] == C) or
+                    (board[16] == C and board[17] == C) or
+                    (board[12] == C and board[18] == C))
+        case 16:
+            return (board[15] == C and board[17] == C) or (board[13] == C and board[19] == C)
+        case 17:
+            # extra OR: (14,20)
+            return ((board[15] == C and board[16] == C) or
+                    (board[3] == C and board[10] == C) or
+                    (board[14] == C and board[20] == C))
+        case 18:
+            # extra OR: (15,12)
+            return ((board[0] == C and board[6] == C) or
+                    (board[19] == C and board[20] == C) or
+                    (board[15] == C and board[12] == C))
+        case 19:
+            return (board[16] == C and board[13] == C) or (board[18] == C and board[20] == C)
+        case 20:
+            # extra OR: (14,17)
+            return ((board[1] == C and board[11] == C) or
+                    (board[18] == C and board[19] == C) or
+                    (board[14] == C and board[17] == C))
+        case _:
+            return False
+
+
+# ---------- Benchmark ----------
+
+def random_boards(count, seed=2024):
+    rng = random.Random(seed)
+    return [''.join(rng.choice('WBxx') for _ in range(21)) for _ in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=500_000,
+                        help="approximate number of calls per implementation")
+    args = parser.parse_args()
+
+    boards = random_boards(max(1, args.calls // 10))
+    lists = [list(b) for b in boards]
+    cases = []
+    for board, board_list in zip(boards, lists):
+        white, black = from_string(board)
+        for j in range(21):
+            # The engine only asks about occupied points.
+            if board[j] != 'x':
+                own = white if board[j] == 'W' else black
+                cases.append((j, board_list, own))
+
+    # All three must agree before their timings mean anything.
+    for j, board_list, own in cases:
+        expected = close_mill_match(j, board_list)
+        assert close_mill_string(j, board_list) == expected
+        assert close_mill(j, own) == expected
+
+    def run_match():
+        for j, board_list, _ in cases:
+            close_mill_match(j, board_list)
+
+    def run_table_string():
+        for j, board_list, _ in cases:
+            close_mill_string(j, board_list)
+
+    def run_bitmask():
+        for j, _, own in cases:
+            close_mill(j, own)
+
+    print(f"{len(cases)} calls per implementation")
+    baseline = None
+    for name, fn in (("match statement (handout)", run_match),
+                     ("mill tables, string board", run_table_string),
+                     ("mill tables, bitboard", run_bitmask)):
+        seconds = min(timeit.repeat(fn, number=1, repeat=5))
+        per_call = seconds / len(cases) * 1e9
+        if baseline is None:
+            baseline = per_call
+        print(f"{name:28s} {per_call:7.1f} ns/call  ({baseline / per_call:4.2f}x)")
+
+    positions = [(board_list, from_string(board)[1]) for board, board_list in zip(boards, lists)]
+    for board_list, black in positions:
+        expected = sum(1 << i for i in range(21)
+                       if board_list[i] == 'B' and not close_mill_match(i, board_list))
+        assert black & ~mill_members(black) == expected
+
+    def run_removable_match():
+        for board_list, _ in positions:
+            [i for i in range(21) if board_list[i] == 'B' and not close_mill_match(i, board_list)]
+
+    def run_removable_members():
+        for _, black in positions:
+            black & ~mill_members(black)
+
+    print()
+    print(f"{len(positions)} removable-piece scans per implementation")
+    baseline = None
+    for name, fn in (("close_mill per piece", run_removable_match),
+                     ("mill_members mask", run_removable_members)):
+        seconds = min(timeit.repeat(fn, number=1, repeat=5))
+        per_scan = seconds / len(positions) * 1e9
+        if baseline is None:
+            baseline = per_scan
+        print(f"{name:28s} {per_scan:7.1f} ns/scan  ({baseline / per_scan:4.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Load generator for the asyncio analysis server (morris/async_server.py).
+
+    python3 -m benchmarks.loadgen --socket /tmp/morris.sock [--connections C]
+                                  [--requests N] [--depth D] [--deadline-ms MS]
+    python3 -m benchmarks.loadgen --port 5151 ...
+
+C connections share N requests over the positions of the search corpus
+(benchmarks/search.py), each connection keeping one request in flight
+(closed loop).  Latency is measured from sending a request to receiving
+its final line; the report gives the throughput in requests/second and
+the latency percentiles, including p99.
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import sys
+import time
+
+from benchmarks.search import CORPUS
+
+
+def percentile(sorted_values, p):
+    """The p-th percentile (nearest rank) of an ascending list."""
+    if not sorted_values:
+        return float('nan')
+    rank = max(1, -(-len(sorted_values) * p // 100))
+    return sorted_values[int(rank) - 1]
+
+
+async def client(args, requests, latencies, errors):
+    if args.socket:
+        reader, writer = await asyncio.open_unix_connection(args.socket)
+    else:
+        reader, writer = await asyncio.open_connection(args.host, args.port)
+    try:
+        for job_id, (name, phase, board) in requests:
+            request = {"id": job_id, "board": board, "phase": phase, "depth": args.depth}
+            if args.deadline_ms is not None:
+                request["deadline_ms"] = args.deadline_ms
+            start = time.perf_counter()
+            writer.write((json.dumps(request) + "\n").encode())
+            await writer.drain()
+            while True:
+                line = await reader.readline()
+                if not line:
+                    raise ConnectionError("server closed the connection")
+                response = json.loads(line)
+                if response.get("type") != "iteration":
+                    break
+            latencies.append(time.perf_counter() - start)
+            if response.get("type") != "result":
+                errors.append((name, response))
+    finally:
+        writer.close()
+
+
+async def run(args):
+    # Deal the requests round-robin to the connections.
+    jobs = list(zip(range(args.requests), itertools.cycle(CORPUS)))
+    shares = [jobs[i::args.connections] for i in range(args.connections)]
+    latencies = []
+    errors = []
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client(args, share, latencies, errors) for share in shares if share))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    ms = [1000 * x for x in latencies]
+    print(f"{len(latencies)} requests over {args.connections} connections in {elapsed:.3f} s")
+    print(f"throughput: {len(latencies) / elapsed:.1f} requests/s")
+    print(f"latency ms: mean {sum(ms) / len(ms):.1f}  p50 {percentile(ms, 50):.1f}  "
+          f"p90 {percentile(ms, 90):.1f}  p99 {percentile(ms, 99):.1f}  max {ms[-1]:.1f}")
+    if errors:
+        print(f"{len(errors)} request(s) did not return a result, e.g. {errors[0]}")
+        return 1
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the asyncio analysis server.")
+    where = parser.add_mutually_exclusive_group(required=True)
+    where.add_argument("--socket", help="Unix domain socket of the server")
+    where.add_argument("--port", type=int, help="TCP port of the server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--connections", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--deadline-ms", type=int)
+    args = parser.parse_args()
+    if args.connections < 1 or args.requests < 1:
+        parser.error("--connections and --requests must be at least 1")
+
+    sys.exit(asyncio.run(run(args)))
+
+
+if __name__ == "__main__":
+    main()
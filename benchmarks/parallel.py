@@ -0,0 +1,117 @@
+"""
+Speedup of the parallel searches against the serial alpha–beta search, for
+an increasing number of processes: root splitting (morris/parallel.py) and
+Lazy SMP (morris/smp.py, the main search plus n - 1 helpers).
+
+    python3 -m benchmarks.parallel [--depth N] [--workers 1,2,4,...] [--position NAME]
+
+Every search of the corpus (benchmarks/search.py) is run serially and then
+with each process count.  Root splitting must agree with the serial best
+move and estimate; Lazy SMP differences are only reported, as its helpers
+race the main search by design.  Pools are started and warmed up before
+timing, so the times measure searching, not process start-up.  By default
+the process counts are the powers of two up to os.cpu_count(), plus the
+core count itself; on a machine with fewer cores than processes the
+speedup can only drop.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+from benchmarks.search import CORPUS
+from morris.board import WHITE, from_string
+from morris.parallel import ParallelRootSearch
+from morris.position import Position, format_move
+from morris.search import Engine
+from morris.smp import LazySMPSearch
+
+
+def default_worker_counts():
+    cores = os.cpu_count() or 1
+    counts = []
+    n = 1
+    while n < cores:
+        counts.append(n)
+        n *= 2
+    counts.append(cores)
+    if cores == 1:
+        counts.append(2)               # still exercise the pool
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Speedup of the parallel root search.")
+    parser.add_argument("--depth", type=int, default=6)
+    parser.add_argument("--workers", help="comma-separated worker counts")
+    parser.add_argument("--position", action="append",
+                        help="only run this corpus position (may be repeated)")
+    args = parser.parse_args()
+
+    counts = ([int(n) for n in args.workers.split(",")] if args.workers
+              else default_worker_counts())
+    corpus = [c for c in CORPUS if not args.position or c[0] in args.position]
+
+    print(f"{os.cpu_count()} cores, depth {args.depth}")
+    serial_total = 0.0
+    parallel_totals = dict.fromkeys(counts, 0.0)
+    smp_totals = dict.fromkeys(counts, 0.0)
+    mismatches = 0
+
+    for name, phase, board in corpus:
+        engine = Engine(phase)
+        start = time.perf_counter()
+        best_move, nodes, estimate = engine.alphabeta(Position(from_string(board), WHITE), args.depth)
+        serial = time.perf_counter() - start
+        serial_total += serial
+        print(f"{name}: serial {serial:.3f} s, {nodes} nodes, best {format_move(best_move)}, estimate {estimate}")
+
+        for workers in counts:
+            engine = Engine(phase)
+            with ParallelRootSearch(engine, workers) as parallel:
+                parallel.search(Position(from_string(board), WHITE), 2)     # start the workers
+                engine.new_search()
+                start = time.perf_counter()
+                p_move, p_nodes, p_estimate = parallel.search(Position(from_string(board), WHITE), args.depth)
+                elapsed = time.perf_counter() - start
+            parallel_totals[workers] += elapsed
+
+            same = (p_move, p_estimate) == (best_move, estimate)
+            if not same:
+                mismatches += 1
+            print(f"  {workers:3d} root split: {elapsed:7.3f} s  speedup {serial / elapsed:5.2f}  "
+                  f"efficiency {serial / elapsed / workers:5.2f}  {p_nodes} nodes"
+                  + ("" if same else f"  MISMATCH best {format_move(p_move)}, estimate {p_estimate}"))
+
+        for workers in counts:
+            engine = Engine(phase)
+            with LazySMPSearch(engine, workers - 1) as smp:
+                smp.search(Position(from_string(board), WHITE), 1)          # start the helpers
+                start = time.perf_counter()
+                p_move, p_nodes, p_estimate, _ = smp.search(Position(from_string(board), WHITE), args.depth)
+                elapsed = time.perf_counter() - start
+                p_nodes += smp.helper_nodes
+            smp_totals[workers] += elapsed
+
+            same = (p_move, p_estimate) == (best_move, estimate)
+            print(f"  {workers:3d} Lazy SMP:   {elapsed:7.3f} s  speedup {serial / elapsed:5.2f}  "
+                  f"efficiency {serial / elapsed / workers:5.2f}  {p_nodes} nodes"
+                  + ("" if same else f"  (best {format_move(p_move)}, estimate {p_estimate})"))
+
+    print()
+    print("processes   mode             total time   speedup   efficiency")
+    print(f"{1:9d}   serial           {serial_total:10.3f}")
+    for workers in counts:
+        for mode, totals in (("root splitting", parallel_totals), ("Lazy SMP", smp_totals)):
+            total = totals[workers]
+            print(f"{workers:9d}   {mode:14s}   {total:10.3f}   {serial_total / total:7.2f}"
+                  f"   {serial_total / total / workers:10.2f}")
+
+    if mismatches:
+        print(f"{mismatches} parallel search(es) disagree with the serial search")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
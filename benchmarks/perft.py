@@ -0,0 +1,200 @@
+"""
+Perft for the move generators: count the leaf nodes of the full move tree
+to a fixed depth from a set of reference positions.
+
+    python3 -m benchmarks.perft [--depth N] [--position NAME] [--update-golden]
+
+Each reference position names its phase (which generator is used, opening
+or midgame/endgame) and the side to move, so both colors' generators are
+exercised.  The tree is walked with make_move/unmake_move on a Position
+exactly as the searches do; the game is not stopped when a side drops
+below three pieces, so the counts measure the generators alone.
+
+Counts for every depth are compared against benchmarks/perft_golden.json
+and any mismatch makes the run exit with status 1.  After a change that is
+meant to alter move generation, rewrite the file with --update-golden.
+
+At every position of the first CHECK_DEPTH plies of each tree, the three
+forms of each generator are also checked against each other for both
+sides: the iter_* generators must yield the moves of generate_*, in the
+same order, and the count_* functions (the mobility terms of the
+estimations) must return their number.  Any disagreement also fails the run.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+from morris.board import WHITE, BLACK, from_string
+from morris.movegen import (
+    generate_add, generate_hopping, generate_move, generate_moves_game, generate_moves_opening,
+    iter_add, iter_hopping, iter_move, iter_moves_game, iter_moves_opening,
+    count_add, count_hopping, count_move, count_moves_game, count_moves_opening,
+)
+from morris.position import Position
+
+GOLDEN_FILE = os.path.join(os.path.dirname(__file__), "perft_golden.json")
+
+GENERATORS = {
+    "opening": generate_moves_opening,
+    "game": generate_moves_game,
+}
+
+# Plies of each tree whose positions check_generators() visits.
+CHECK_DEPTH = 3
+
+# (name, list generator, streaming generator, counter) checked at every node
+GENERATOR_FORMS = (
+    ("moves_opening", generate_moves_opening, iter_moves_opening, count_moves_opening),
+    ("add", generate_add, iter_add, count_add),
+    ("moves_game", generate_moves_game, iter_moves_game, count_moves_game),
+    ("move", generate_move, iter_move, count_move),
+    ("hopping", generate_hopping, iter_hopping, count_hopping),
+)
+
+# (name, phase, side to move, board, default depth)
+POSITIONS = (
+    ("opening-empty", "opening", WHITE, "xxxxxxxxxxxxxxxxxxxxx", 4),
+    ("opening-early", "opening", BLACK, "xWxBxxWxBxxxWxBxxxxxx", 4),
+    ("opening-mills", "opening", WHITE, "WWxBBxWxBxxWBxxWBxBxx", 4),
+    ("game-middle", "game", WHITE, "WWBBWxBxxWBxxBxWxxBxW", 5),
+    ("game-middle-black", "game", BLACK, "WWBBWxBxxWBxxBxWxxBxW", 5),
+    ("game-crowded", "game", WHITE, "WBxBxxxWxxBxxxxWBxBBx", 4),
+    ("game-hopping", "game", WHITE, "WxxBxxBxxWxBxxxxWxBxB", 4),
+    ("game-hopping-black", "game", BLACK, "WWxBxxxxxxBxxxxWBxBxx", 4),
+)
+
+
+def perft(position, depth, generate):
+    """Number of leaf nodes of the move tree below `position` at `depth`."""
+    moves = generate(position.bits, position.side)
+    if depth == 1:
+        return len(moves)
+
+    nodes = 0
+    for move in moves:
+        position.make_move(move)
+        nodes += perft(position, depth - 1, generate)
+        position.unmake_move(move)
+    return nodes
+
+
+def check_generators(position, depth, generate, mismatches):
+    """
+    Check every form of every generator for both sides at `position` and
+    at the positions of its move tree down to `depth` plies, appending a
+    description of each disagreement to `mismatches`.  Returns the number
+    of positions checked.
+    """
+    board = position.board()
+    for side in (WHITE, BLACK):
+        where = f"{position}, {'White' if side == WHITE else 'Black'}"
+        for name, generate_form, iter_form, count_form in GENERATOR_FORMS:
+            moves = generate_form(board, side)
+            if list(iter_form(board, side)) != moves:
+                mismatches.append(f"iter_{name} differs from generate_{name} ({where})")
+            count = count_form(board, side)
+            if count != len(moves):
+                mismatches.append(f"count_{name} is {count}, generate_{name} has "
+                                  f"{len(moves)} moves ({where})")
+    if depth == 0:
+        return 1
+
+    checked = 1
+    for move in generate(position.bits, position.side):
+        position.make_move(move)
+        checked += check_generators(position, depth - 1, generate, mismatches)
+        position.unmake_move(move)
+    return checked
+
+
+def load_golden():
+    if not os.path.exists(GOLDEN_FILE):
+        return {}
+    with open(GOLDEN_FILE, "r") as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Perft for the move generators.")
+    parser.add_argument("--depth", type=int,
+                        help="depth for every position (default: each position's own)")
+    parser.add_argument("--position", action="append",
+                        help="only run this reference position (may be repeated)")
+    parser.add_argument("--update-golden", action="store_true",
+                        help=f"write the counts to {os.path.basename(GOLDEN_FILE)}")
+    args = parser.parse_args()
+
+    positions = POSITIONS
+    if args.position:
+        unknown = set(args.position) - {p[0] for p in POSITIONS}
+        if unknown:
+            parser.error(f"unknown position(s): {', '.join(sorted(unknown))}")
+        positions = [p for p in POSITIONS if p[0] in args.position]
+
+    golden = load_golden()
+    failures = 0
+    total_nodes = 0
+    total_seconds = 0.0
+
+    for name, phase, side, board, default_depth in positions:
+        generate = GENERATORS[phase]
+        max_depth = args.depth or default_depth
+        position = Position(from_string(board), side)
+        counts = []
+
+        print(f"{name} ({phase}, {'White' if side == WHITE else 'Black'} to move) {board}")
+        for depth in range(1, max_depth + 1):
+            start = time.perf_counter()
+            nodes = perft(position, depth, generate)
+            seconds = time.perf_counter() - start
+            counts.append(nodes)
+            total_nodes += nodes
+            total_seconds += seconds
+
+            expected = golden.get(name, [])
+            if depth <= len(expected):
+                status = "ok" if expected[depth - 1] == nodes else f"MISMATCH (expected {expected[depth - 1]})"
+            else:
+                status = "no golden count"
+            if status.startswith("MISMATCH"):
+                failures += 1
+
+            rate = nodes / seconds if seconds > 0 else float('inf')
+            print(f"  depth {depth}: {nodes:>10} nodes  {seconds:8.3f} s  {rate:>12,.0f} nodes/s  {status}")
+
+        mismatches = []
+        start = time.perf_counter()
+        checked = check_generators(position, min(max_depth - 1, CHECK_DEPTH), generate, mismatches)
+        seconds = time.perf_counter() - start
+        if mismatches:
+            failures += len(mismatches)
+            for mismatch in mismatches[:10]:
+                print(f"  MISMATCH {mismatch}")
+            if len(mismatches) > 10:
+                print(f"  ... and {len(mismatches) - 10} more")
+        print(f"  generator forms checked at {checked} positions  {seconds:8.3f} s  "
+              f"{'ok' if not mismatches else f'{len(mismatches)} MISMATCHES'}")
+
+        if args.update_golden:
+            old = golden.get(name, [])
+            golden[name] = counts + old[len(counts):]
+
+    rate = total_nodes / total_seconds if total_seconds > 0 else float('inf')
+    print(f"total: {total_nodes} nodes in {total_seconds:.3f} s ({rate:,.0f} nodes/s)")
+
+    if args.update_golden:
+        with open(GOLDEN_FILE, "w") as f:
+            json.dump(golden, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"wrote {GOLDEN_FILE}")
+    elif failures:
+        print(f"{failures} count(s) differ from {os.path.basename(GOLDEN_FILE)} "
+              f"or between the forms of a generator")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+"""
+Benchmark and regression gate for the search entry points.
+
+    python3 -m benchmarks.search [--mode NAME] [--repeat N] [--output FILE]
+                                 [--time-threshold PCT] [--node-threshold PCT]
+                                 [--update-baseline [--times-only]]
+
+Every search mode (MINIMAX, alpha–beta, principal variation search and
+MTD(f), with the handout and the improved estimations, White and Black to
+move) is run on a fixed corpus of opening, midgame and hopping-endgame
+positions at several depths.  Each run gets a fresh Engine so node counts
+do not depend on what ran before.  Wall time is the best of --repeat runs.
+
+The results (time, nodes evaluated, best move and estimate per run) are
+written as JSON and compared against benchmarks/search_baseline.json.  The
+run fails (exit status 1) when a run got slower or evaluated more nodes
+than the baseline by more than the thresholds, or when an estimate
+changed, which means the search itself is broken.  A different best move
+with the same estimate is only reported: ordering changes may pick another
+of several equally good moves.
+
+Times in the baseline are only meaningful on the machine that wrote it;
+refresh them with --update-baseline --times-only before comparing on
+another machine.  That rewrites only the times, and only when the node
+counts and estimates pass the gate; a plain --update-baseline accepts
+whatever the search now does, node counts and estimates included, and is
+meant for changes that alter them on purpose.
+"""
+
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+
+from morris.board import WHITE, BLACK, from_string
+from morris.position import Position, format_move
+from morris.search import Engine, OPENING, GAME
+
+BASELINE_FILE = os.path.join(os.path.dirname(__file__), "search_baseline.json")
+
+# Searches faster than this are dominated by timer noise and are not
+# checked for time regressions (their node counts still are).
+MIN_TIMED_SECONDS = 0.02
+
+# (name, phase, board)
+CORPUS = (
+    ("opening-empty", OPENING, "xxxxxxxxxxxxxxxxxxxxx"),
+    ("opening-early", OPENING, "xWxBxxWxBxxxWxBxxxxxx"),
+    ("opening-late", OPENING, "WWxBBxWxBxxWBxxWBxBxx"),
+    ("game-middle", GAME, "WWBBWxBxxWBxxBxWxxBxW"),
+    ("game-crowded", GAME, "WBxBxxxWxxBxxxxWBxBBx"),
+    ("game-hopping-white", GAME, "WxxBxxBxxWxBxxxxWxBxB"),    # White has 3 pieces
+    ("game-hopping-black", GAME, "BxxWxxWxxBxWxxxxBxWxW"),    # Black has 3 pieces
+    ("game-lost", GAME, "WBBxWBBxBBxWxxxxBxBWB"),         # lost for Black to move
+    ("game-blocked", GAME, "WBBxWBBxBxBWxxxxBxBWB"),      # White cannot move
+)
+
+# (name, algorithm, side to move, improved estimation, depths)
+MODES = (
+    ("minimax", "minimax", WHITE, False, (1, 2, 3)),
+    ("minimax-black", "minimax", BLACK, False, (1, 2, 3)),
+    ("minimax-improved", "minimax", WHITE, True, (1, 2, 3)),
+    ("alphabeta", "alphabeta", WHITE, False, (2, 3, 4, 5)),
+    ("alphabeta-black", "alphabeta", BLACK, False, (2, 3, 4, 5)),
+    ("alphabeta-improved", "alphabeta", WHITE, True, (2, 3, 4, 5)),
+    ("pvs", "pvs", WHITE, False, (2, 3, 4, 5)),
+    ("pvs-black", "pvs", BLACK, False, (2, 3, 4, 5)),
+    ("pvs-improved", "pvs", WHITE, True, (2, 3, 4, 5)),
+    ("mtdf", "mtdf", WHITE, False, (2, 3, 4, 5)),
+    ("mtdf-black", "mtdf", BLACK, False, (2, 3, 4, 5)),
+    ("mtdf-improved", "mtdf", WHITE, True, (2, 3, 4, 5)),
+)
+
+
+def run_once(phase, board, algorithm, side, improved, depth):
+    """
+    Search one position with a fresh engine; return (seconds, result).
+    The garbage collector is paused while timing, as timeit does.
+    """
+    if algorithm == "minimax":
+        engine = Engine(phase, improved=improved)
+        search = engine.minimax
+    else:
+        engine = Engine(phase, improved=improved, variant=algorithm)
+        search = engine.search
+    position = Position(from_string(board), side)
+    gc.collect()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        result = search(position, depth)
+        return time.perf_counter() - start, result
+    finally:
+        gc.enable()
+
+
+def run_benchmarks(modes, repeat):
+    results = []
+    for mode, algorithm, side, improved, depths in modes:
+        for name, phase, board in CORPUS:
+            for depth in depths:
+                seconds = float('inf')
+                for _ in range(repeat):
+                    elapsed, (best_move, nodes, estimate) = run_once(
+                        phase, board, algorithm, side, improved, depth)
+                    seconds = min(seconds, elapsed)
+                results.append({
+                    "mode": mode,
+                    "position": name,
+                    "depth": depth,
+                    "seconds": round(seconds, 6),
+                    "nodes": nodes,
+                    "best_move": format_move(best_move) if best_move is not None else None,
+                    "estimate": estimate,
+                })
+                print(f"{mode:20s} {name:20s} depth {depth}: {seconds:8.4f} s {nodes:>9} nodes  "
+                      f"best {results[-1]['best_move']}  estimate {estimate}")
+    return results
+
+
+def result_key(result):
+    return result["mode"], result["position"], result["depth"]
+
+
+def compare(results, baseline, time_threshold, node_threshold):
+    """Print the regressions against `baseline`; return how many there are."""
+    expected = {result_key(r): r for r in baseline}
+    failures = 0
+    for result in results:
+        old = expected.get(result_key(result))
+        if old is None:
+            continue
+        label = "{} {} depth {}".format(*result_key(result))
+
+        if result["estimate"] != old["estimate"]:
+            print(f"FAIL {label}: estimate {result['estimate']} (baseline {old['estimate']})")
+            failures += 1
+        elif result["best_move"] != old["best_move"]:
+            print(f"note {label}: best move {result['best_move']} (baseline {old['best_move']})")
+
+        if result["nodes"] > old["nodes"] * (1 + node_threshold / 100):
+            print(f"FAIL {label}: {result['nodes']} nodes (baseline {old['nodes']})")
+            failures += 1
+
+        if (old["seconds"] >= MIN_TIMED_SECONDS
+                and result["seconds"] > old["seconds"] * (1 + time_threshold / 100)):
+            print(f"FAIL {label}: {result['seconds']:.4f} s (baseline {old['seconds']:.4f} s)")
+            failures += 1
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the search entry points.")
+    parser.add_argument("--mode", action="append", choices=[m[0] for m in MODES],
+                        help="only run this mode (may be repeated)")
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="runs per search; the fastest is kept (default 5)")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--time-threshold", type=float, default=25.0,
+                        help="allowed slowdown against the baseline in percent (default 25)")
+    parser.add_argument("--node-threshold", type=float, default=0.0,
+                        help="allowed growth in nodes evaluated in percent (default 0)")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help=f"write the results to {os.path.basename(BASELINE_FILE)}")
+    parser.add_argument("--times-only", action="store_true",
+                        help="with --update-baseline: only refresh the times of the runs "
+                             "already in the baseline, if nodes and estimates still match")
+    args = parser.parse_args()
+    if args.times_only and not args.update_baseline:
+        parser.error("--times-only needs --update-baseline")
+
+    modes = [m for m in MODES if not args.mode or m[0] in args.mode]
+    results = run_benchmarks(modes, args.repeat)
+
+    total = sum(r["seconds"] for r in results)
+    print(f"total: {len(results)} searches in {total:.3f} s")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+
+    if args.update_baseline and args.times_only:
+        if not os.path.exists(BASELINE_FILE):
+            print(f"no baseline at {BASELINE_FILE}; run with --update-baseline first")
+            sys.exit(1)
+        with open(BASELINE_FILE, "r") as f:
+            baseline = json.load(f)
+        failures = compare(results, baseline, float('inf'), args.node_threshold)
+        if failures:
+            print(f"{failures} regression(s) against {os.path.basename(BASELINE_FILE)}; "
+                  f"times not updated")
+            sys.exit(1)
+        seconds = {result_key(r): r["seconds"] for r in results}
+        for r in baseline:
+            r["seconds"] = seconds.get(result_key(r), r["seconds"])
+        with open(BASELINE_FILE, "w") as f:
+            json.dump(baseline, f, indent=2)
+            f.write("\n")
+        print(f"updated the times in {BASELINE_FILE}")
+        return
+
+    if args.update_baseline:
+        baseline = []
+        if os.path.exists(BASELINE_FILE):
+            with open(BASELINE_FILE, "r") as f:
+                baseline = json.load(f)
+        updated = {result_key(r) for r in results}
+        baseline = [r for r in baseline if result_key(r) not in updated] + results
+        with open(BASELINE_FILE, "w") as f:
+            json.dump(baseline, f, indent=2)
+            f.write("\n")
+        print(f"wrote {BASELINE_FILE}")
+        return
+
+    if not os.path.exists(BASELINE_FILE):
+        print(f"no baseline at {BASELINE_FILE}; run with --update-baseline first")
+        return
+
+    with open(BASELINE_FILE, "r") as f:
+        baseline = json.load(f)
+    failures = compare(results, baseline, args.time_threshold, args.node_threshold)
+    if failures:
+        print(f"{failures} regression(s) against {os.path.basename(BASELINE_FILE)}")
+        sys.exit(1)
+    print(f"no regressions against {os.path.basename(BASELINE_FILE)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,3 @@
+"""
+Shared engine code for the Morris Variant scripts.
+"""
@@ -0,0 +1,331 @@
+"""
+asyncio front end for the analysis daemon: many clients and many searches
+at once, with deadlines, cancellation and streamed iterative-deepening
+results.
+
+    python3 -m morris.async_server --socket /tmp/morris.sock [--workers N]
+    python3 -m morris.async_server --port 5151 [--workers N]
+
+Searches run in a pool of worker processes (one search per worker at a
+time, os.cpu_count() workers by default); every worker keeps one warm
+Engine per configuration, as the threaded daemon (morris/server.py) does.
+
+The protocol is line-delimited JSON as in morris/server.py, with an "id"
+chosen by the client so that requests on one connection can overlap:
+
+    {"id": 7, "board": ..., "depth": 6, ...}      search (fields as in server.py)
+        "deadline_ms": 500   answer within 500 ms of arrival with the deepest
+                             completed iteration (MINIMAX jobs, and jobs still
+                             queued then, get a "deadline exceeded" error)
+        "stream": true       also send every completed iteration (alpha–beta
+                             then always runs by iterative deepening)
+    {"id": 7, "cancel": true}                     stop search 7
+
+Every line the server sends carries the id of its request and a "type":
+
+    {"id": 7, "type": "iteration", "depth": 3, "best_move": ..., "estimate": ...,
+     "positions_evaluated": ...}
+    {"id": 7, "type": "result", ...the fields of a server.py response...}
+    {"id": 7, "type": "cancelled"}
+    {"id": 7, "type": "error", "error": "..."}
+
+A job ends with exactly one result, cancelled or error line.  Jobs of a
+client that disconnects are cancelled.
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import time
+
+from morris.deepening import SearchTimeout
+from morris.position import format_move
+from morris.search import ALPHABETA
+from morris.server import AnalysisService
+from morris.smp import StopClock
+
+
+# ---------- Worker processes ----------
+
+class _WorkerService(AnalysisService):
+    """AnalysisService whose engines can be stopped through `stop_event`."""
+
+    def __init__(self, stop_event, tt_entries=None):
+        super().__init__(tt_entries)
+        self.stop_event = stop_event
+
+    def engine(self, phase, improved, ordering, quiescence=False, variant=ALPHABETA, symmetry=False):
+        engine = super().engine(phase, improved, ordering, quiescence, variant, symmetry)
+        if not isinstance(engine.search_clock, StopClock):
+            engine.search_clock = StopClock(self.stop_event)
+        return engine
+
+
+def _worker_main(conn, stop_event, tt_entries):
+    """
+    Worker loop: receive (request, stream) jobs from `conn` and send back
+    ('iteration', record) messages followed by one ('result', response),
+    ('stopped', None) or ('error', message).
+    """
+    service = _WorkerService(stop_event, tt_entries)
+
+    while True:
+        job = conn.recv()
+        if job is None:
+            break
+        request, stream = job
+
+        def on_iteration(best_move, nodes, estimate, depth):
+            conn.send(('iteration', {
+                "depth": depth,
+                "best_move": format_move(best_move) if best_move is not None else None,
+                "estimate": estimate if best_move is not None else None,
+                "positions_evaluated": nodes,
+            }))
+
+        try:
+            response = service.handle(request, on_iteration=on_iteration if stream else None)
+        except SearchTimeout:
+            conn.send(('stopped', None))
+        except Exception as e:
+            # Anything else is the job's failure, not the worker's: keep serving.
+            conn.send(('error', str(e) or type(e).__name__))
+        else:
+            conn.send(('result', response))
+
+
+class Worker:
+    """Handle of one worker process, owned by the event loop."""
+
+    def __init__(self, tt_entries=None):
+        self.conn, child_conn = multiprocessing.Pipe()
+        self.stop_event = multiprocessing.Event()
+        self.process = multiprocessing.Process(
+            target=_worker_main, args=(child_conn, self.stop_event, tt_entries), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.messages = asyncio.Queue()
+        self.alive = True
+        asyncio.get_running_loop().add_reader(self.conn.fileno(), self._readable)
+
+    def _readable(self):
+        try:
+            while self.conn.poll():
+                self.messages.put_nowait(self.conn.recv())
+        except (EOFError, OSError):
+            # The process is gone: stop watching its pipe, which would
+            # stay readable forever, and fail the job it was running.
+            self.alive = False
+            asyncio.get_running_loop().remove_reader(self.conn.fileno())
+            self.messages.put_nowait(('error', "search process exited"))
+
+    def start(self, request, stream):
+        self.stop_event.clear()
+        self.conn.send((request, stream))
+
+    def stop(self):
+        self.stop_event.set()
+
+    def close(self):
+        asyncio.get_running_loop().remove_reader(self.conn.fileno())
+        try:
+            self.conn.send(None)
+        except OSError:
+            pass
+        self.process.join(timeout=1)
+        if self.process.is_alive():
+            self.process.terminate()
+        self.conn.close()
+
+
+# ---------- Server ----------
+
+class Job:
+    def __init__(self, job_id, request):
+        self.id = job_id
+        self.request = request
+        self.worker = None
+        self.received = time.perf_counter()
+        self.cancelled = False
+        self.deadline_hit = False
+
+
+class AsyncAnalysisServer:
+
+    def __init__(self, workers, tt_entries=None):
+        self.tt_entries = tt_entries
+        self.pool = [Worker(tt_entries) for _ in range(workers)]
+        self.idle = asyncio.Queue()
+        for worker in self.pool:
+            self.idle.put_nowait(worker)
+
+    def close(self):
+        for worker in self.pool:
+            worker.close()
+
+    def respawn(self, worker):
+        """Replace a worker whose process exited with a fresh one."""
+        worker.close()
+        replacement = Worker(self.tt_entries)
+        self.pool[self.pool.index(worker)] = replacement
+        return replacement
+
+    async def run_job(self, job, send):
+        request = job.request
+        stream = bool(request.get("stream", False))
+        deadline_ms = request.get("deadline_ms")
+        if deadline_ms is not None and (not isinstance(deadline_ms, (int, float)) or deadline_ms <= 0):
+            send({"id": job.id, "type": "error", "error": "deadline_ms must be positive"})
+            return
+
+        worker = await self.idle.get()
+        if not worker.alive:
+            worker = self.respawn(worker)
+        job.worker = worker
+        timer = None
+        try:
+            if job.cancelled:
+                send({"id": job.id, "type": "cancelled"})
+                return
+
+            if deadline_ms is not None:
+                # The deadline counts from the arrival of the request, so
+                # the time spent waiting for a worker is taken off.
+                remaining_ms = deadline_ms - (time.perf_counter() - job.received) * 1000
+                if remaining_ms <= 0:
+                    send({"id": job.id, "type": "error", "error": "deadline exceeded"})
+                    return
+                # Alpha–beta stops deepening by itself (as with time_ms); the
+                # stop event ends whatever cannot (MINIMAX, an overlong first
+                # iteration).
+                if request.get("algorithm", "alphabeta") == "alphabeta":
+                    budget = request.get("time_ms")
+                    budget = int(remaining_ms) if budget is None else min(budget, int(remaining_ms))
+                    request = dict(request, time_ms=max(budget, 1))
+
+                def hit_deadline():
+                    job.deadline_hit = True
+                    worker.stop()
+                timer = asyncio.get_running_loop().call_later(remaining_ms / 1000, hit_deadline)
+
+            worker.start(request, stream)
+            while True:
+                kind, payload = await worker.messages.get()
+                if kind == 'iteration':
+                    if not job.cancelled:
+                        send(dict(id=job.id, type="iteration", **payload))
+                    continue
+                if job.cancelled:
+                    send({"id": job.id, "type": "cancelled"})
+                elif kind == 'result':
+                    send(dict(id=job.id, type="result", **payload))
+                elif kind == 'stopped':
+                    message = "deadline exceeded" if job.deadline_hit else "stopped"
+                    send({"id": job.id, "type": "error", "error": message})
+                else:
+                    send({"id": job.id, "type": "error", "error": payload})
+                return
+        finally:
+            if timer is not None:
+                timer.cancel()
+            job.worker = None
+            if not worker.alive:
+                worker = self.respawn(worker)
+            self.idle.put_nowait(worker)
+
+    async def handle_client(self, reader, writer):
+        jobs = {}
+        tasks = set()
+
+        def send(message):
+            if not writer.is_closing():
+                writer.write((json.dumps(message) + "\n").encode())
+
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict) or "id" not in request:
+                        raise ValueError("request must be a JSON object with an id")
+                except ValueError as e:
+                    send({"id": None, "type": "error", "error": str(e)})
+                    continue
+
+                job_id = request["id"]
+                if request.get("cancel"):
+                    job = jobs.get(job_id)
+                    if job is not None:
+                        job.cancelled = True
+                        if job.worker is not None:
+                            job.worker.stop()
+                    continue
+                if job_id in jobs:
+                    send({"id": job_id, "type": "error", "error": "id already in use"})
+                    continue
+
+                job = jobs[job_id] = Job(job_id, request)
+                task = asyncio.create_task(self.run_job(job, send))
+                tasks.add(task)
+                task.add_done_callback(lambda t, job_id=job_id: (tasks.discard(t), jobs.pop(job_id, None)))
+                await writer.drain()
+        finally:
+            for job in jobs.values():             # client went away
+                job.cancelled = True
+                if job.worker is not None:
+                    job.worker.stop()
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+            writer.close()
+
+
+async def serve(args):
+    server = AsyncAnalysisServer(args.workers, args.tt_entries)
+    try:
+        if args.socket:
+            if os.path.exists(args.socket):
+                os.unlink(args.socket)        # left over from an earlier run
+            listener = await asyncio.start_unix_server(server.handle_client, path=args.socket)
+            where = args.socket
+        else:
+            listener = await asyncio.start_server(server.handle_client, args.host, args.port)
+            where = "{}:{}".format(*listener.sockets[0].getsockname()[:2])
+        print(f"listening on {where} with {args.workers} workers", flush=True)
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        server.close()
+        if args.socket and os.path.exists(args.socket):
+            os.unlink(args.socket)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve concurrent searches over a local socket.")
+    where = parser.add_mutually_exclusive_group(required=True)
+    where.add_argument("--socket", help="listen on this Unix domain socket path")
+    where.add_argument("--port", type=int, help="listen on this TCP port")
+    parser.add_argument("--host", default="127.0.0.1",
+                        help="TCP address to bind (default 127.0.0.1)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="search processes (default: one per core)")
+    parser.add_argument("--tt-entries", type=int,
+                        help="transposition table slots per engine")
+    args = parser.parse_args()
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Batch analysis: search many positions in one process.
+
+    python3 -m morris.batch [input_file] [--phase opening|game] [--black]
+                            [--minimax] [--improved] [--no-ordering]
+                            [--variant alphabeta|pvs|mtdf] [--depth N] [--time-ms MS]
+
+Positions are read one 21-character board per line from input_file, or
+from stdin when it is omitted or '-'; blank lines are skipped.  Each result
+is written to stdout as one JSON object per line as soon as its search
+finishes:
+
+    {"board": ..., "best_board": ..., "best_move": ..., "estimate": ...,
+     "nodes": ..., "depth": ..., "seconds": ...}
+
+A line that is not a valid board gets {"board": ..., "error": ...} and the
+batch carries on; a board without legal moves gets null for the best
+board, move and estimate.
+
+One Engine serves the whole batch, so the transposition table and the
+killer/history tables stay warm from one position to the next; between
+positions they are only aged (Engine.new_search).
+"""
+
+import argparse
+import json
+import sys
+import time
+
+from morris.board import WHITE, BLACK, from_string, to_string
+from morris.position import Position, format_move
+from morris.search import Engine, OPENING, GAME, ALPHABETA, VARIANTS
+
+
+def parse_board(line):
+    """Return the (white, black) board of a line, or raise ValueError."""
+    board_string = line.strip()
+    if len(board_string) != 21:
+        raise ValueError("Board position must be exactly 21 characters long.")
+    if set(board_string) - set("WBx"):
+        raise ValueError("Board position may only contain 'W', 'B' and 'x'.")
+    return from_string(board_string)
+
+
+def analyze(engine, board, side, algorithm, depth=None, time_ms=None, on_iteration=None):
+    """
+    Search one position with `engine` and return the result record
+    (without the input board).
+
+    Alpha–beta runs by iterative deepening when there is a time budget or
+    an on_iteration callback (see iterative_deepening) to report to.
+    """
+    position = Position(board, side)
+    start = time.perf_counter()
+    if algorithm == "minimax":
+        best_move, nodes, estimate = engine.minimax(position, depth)
+    elif time_ms is None and on_iteration is None:
+        best_move, nodes, estimate = engine.search(position, depth)
+    else:
+        budget_ms = float('inf') if time_ms is None else time_ms
+        best_move, nodes, estimate, depth = engine.deepen(
+            position, budget_ms, max_depth=depth, on_iteration=on_iteration)
+    seconds = time.perf_counter() - start
+
+    if best_move is None:                  # no legal moves: +-inf is not JSON
+        best_board = None
+        estimate = None
+    else:
+        position.make_move(best_move)
+        best_board = to_string(position.bits)
+
+    return {
+        "best_board": best_board,
+        "best_move": format_move(best_move) if best_move is not None else None,
+        "estimate": estimate,
+        "nodes": nodes,
+        "depth": depth,
+        "seconds": round(seconds, 6),
+    }
+
+
+def run_batch(lines, out, engine, side, algorithm, depth=None, time_ms=None):
+    """Analyze every board in `lines`, writing one JSON line per board to `out`."""
+    for line in lines:
+        board_string = line.strip()
+        if not board_string:
+            continue
+
+        record = {"board": board_string}
+        try:
+            board = parse_board(board_string)
+        except ValueError as e:
+            record["error"] = str(e)
+        else:
+            engine.new_search()
+            record.update(analyze(engine, board, side, algorithm, depth, time_ms))
+
+        out.write(json.dumps(record) + "\n")
+        out.flush()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Search every board of a file (or stdin) and print JSON Lines.")
+    parser.add_argument("input_file", nargs="?", default="-",
+                        help="one board per line; '-' or omitted reads stdin")
+    parser.add_argument("--phase", choices=(OPENING, GAME), default=GAME)
+    parser.add_argument("--black", action="store_true", help="Black is to move")
+    parser.add_argument("--minimax", action="store_true",
+                        help="plain MINIMAX instead of alpha-beta")
+    parser.add_argument("--improved", action="store_true",
+                        help="use the improved static estimation")
+    parser.add_argument("--no-ordering", action="store_true",
+                        help="search children in generation order (as in the handout)")
+    parser.add_argument("--variant", choices=VARIANTS, default=ALPHABETA,
+                        help="alpha-beta variant (default: alphabeta, as in the handout)")
+    parser.add_argument("--depth", type=int,
+                        help="search depth (the maximum depth when --time-ms is given)")
+    parser.add_argument("--time-ms", type=int,
+                        help="alpha-beta by iterative deepening within this many milliseconds per board")
+    args = parser.parse_args()
+
+    if args.depth is None and args.time_ms is None:
+        parser.error("a --depth or a --time-ms budget is required")
+    if args.minimax and args.time_ms is not None:
+        parser.error("--time-ms needs alpha-beta")
+    if args.minimax and args.depth is None:
+        parser.error("--minimax needs a --depth")
+    if args.minimax and args.variant != ALPHABETA:
+        parser.error("--variant needs alpha-beta")
+
+    engine = Engine(args.phase, improved=args.improved, ordering=not args.no_ordering,
+                    variant=args.variant)
+    side = BLACK if args.black else WHITE
+    algorithm = "minimax" if args.minimax else "alphabeta"
+
+    try:
+        if args.input_file == "-":
+            run_batch(sys.stdin, sys.stdout, engine, side, algorithm, args.depth, args.time_ms)
+        else:
+            with open(args.input_file, "r") as f:
+                run_batch(f, sys.stdout, engine, side, algorithm, args.depth, args.time_ms)
+    except BrokenPipeError:                # reader went away (e.g. piped into head)
+        sys.stderr.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Bitboard representation of the Morris Variant board.
+
+A position is a pair of 21-bit integers (white, black): bit i of `white` is
+set when White has a piece on board index i, and likewise for `black`.
+The 21-character 'W'/'B'/'x' strings from the handout are only used at the
+file I/O boundary (from_string / to_string); everything in between -- move
+generation, static estimation and the searches -- works on these integers.
+
+A board may also carry the pieces each side still has to place, as
+(white, black, white_in_hand, black_in_hand); see PHASED in morris/search.py.
+Everything that only looks at the pieces on the board reads board[WHITE] and
+board[BLACK] and accepts either form.
+"""
+
+# Index of each color's bitboard within a (white, black) position.
+WHITE = 0
+BLACK = 1
+
+NUM_SQUARES = 21
+ALL_SQUARES = (1 << NUM_SQUARES) - 1
+
+# Pieces each side places during the opening (Nine Men's Morris).
+PIECES_PER_SIDE = 9
+
+# Moves are (origin, target, removed) tuples of board indices; NO_SQUARE
+# marks a missing origin (opening placement) or no removal.
+NO_SQUARE = -1
+
+# BIT[i] is the single-bit mask of board index i.
+BIT = tuple(1 << i for i in range(NUM_SQUARES))
+
+# Adjacency of the Variant Morris board graph (same lists, in the same order,
+# as the handout's neighbors() so generation order is unchanged).
+NEIGHBORS = (
+    (1, 2, 6),          # 0
+    (0, 3, 11),         # 1
+    (0, 3, 7, 4),       # 2
+    (1, 2, 5, 10),      # 3
+    (2, 5, 8),          # 4
+    (3, 4, 9),          # 5
+    (0, 7, 18),         # 6
+    (2, 6, 8, 15),      # 7
+    (4, 7, 12),         # 8
+    (5, 10, 14),        # 9
+    (3, 9, 11, 17),     # 10
+    (1, 10, 20),        # 11
+    (8, 13, 15),        # 12
+    (12, 14, 16),       # 13
+    (9, 13, 17),        # 14
+    (7, 12, 16, 18),    # 15
+    (13, 15, 17, 19),   # 16
+    (10, 14, 16, 20),   # 17
+    (6, 15, 19),        # 18
+    (16, 18, 20),       # 19
+    (11, 17, 19),       # 20
+)
+
+NEIGHBOR_MASKS = tuple(
+    sum(BIT[j] for j in NEIGHBORS[i]) for i in range(NUM_SQUARES)
+)
+
+
+def neighbors(position):
+    """
+    Given a board index (0–20), return a list of indices that are adjacent
+    to that position according to the Variant Morris board graph.
+    """
+    return list(NEIGHBORS[position])
+
+
+def from_string(board):
+    """
+    Convert a 21-character 'W'/'B'/'x' board string into a (white, black)
+    bitboard pair.
+    """
+    white = 0
+    black = 0
+    for i, c in enumerate(board):
+        if c == 'W':
+            white |= BIT[i]
+        elif c == 'B':
+            black |= BIT[i]
+    return white, black
+
+
+def to_string(board):
+    """
+    Convert a (white, black) bitboard pair back into the 21-character
+    board string used by the input/output files.
+    """
+    white, black = board[WHITE], board[BLACK]
+    return ''.join(
+        'W' if white & BIT[i] else 'B' if black & BIT[i] else 'x'
+        for i in range(NUM_SQUARES)
+    )
+
+
+def pieces_in_hand(board):
+    """
+    The pieces (white, black) still to place on `board`, assuming none has
+    been removed yet: PIECES_PER_SIDE less the pieces on the board.
+    """
+    return (max(PIECES_PER_SIDE - board[WHITE].bit_count(), 0),
+            max(PIECES_PER_SIDE - board[BLACK].bit_count(), 0))
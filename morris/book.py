@@ -0,0 +1,248 @@
+"""
+Opening book: the best placements of the first plies of the game, searched
+deeply once and looked up instead of searched again.
+
+    python3 -m morris.book build [--plies K] [--depth D] [--improved] [--file FILE]
+    python3 -m morris.book probe <board> [--black] [--file FILE]
+    python3 -m morris.book verify [--file FILE]
+
+The book covers every position reached from the empty board in at most K
+placements (White first; generate_add / generate_add_black), with either
+side to move, up to the symmetries of the board (morris/symmetry.py).
+Each is searched by alpha–beta to depth D with the opening estimation of
+the handout (--improved: the improved one) and stored with its best move
+and estimate.  The opening scripts probe it with --book; verify searches
+every position again with a fresh engine and reports the entries that
+differ.
+
+A book file is a 24-byte header followed by one 16-byte record per
+position, sorted by key:
+
+    header   b"MORRISBK", version (1), improved (0/1), plies, 5 reserved
+             bytes, record count (8 bytes)
+    record   key (8 bytes): white | black << 21 | side << 42 of the
+                 canonical form of the position
+             estimate (4 bytes, signed; White's point of view)
+             origin + 1, target, removed + 1 of the best move, in the
+                 canonical form (1 byte each)
+             depth of the search (1 byte)
+
+little-endian throughout.  The file is mapped as the tables of
+morris/packed.py are, and a probe is a binary search over the mapping.
+"""
+
+import argparse
+import os
+import struct
+import sys
+import time
+
+from morris.board import BIT, BLACK, NO_SQUARE, NUM_SQUARES, WHITE, from_string, to_string
+from morris.movegen import generate_add, generate_add_black
+from morris.packed import map_file, write_file
+from morris.position import Position, format_move
+from morris.search import Engine, OPENING
+from morris.symmetry import INVERSES, canonical, transform_move
+
+DEFAULT_DIRECTORY = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                 "books")
+DEFAULT_PLIES = 3
+DEFAULT_DEPTH = 8
+
+MAGIC = b"MORRISBK"
+VERSION = 1
+
+_HEADER = struct.Struct("<8sBBB5xQ")
+_RECORD = struct.Struct("<QiBBBB")
+HEADER_SIZE = _HEADER.size
+
+
+def default_path(improved=False):
+    """The book of the handout's (or the improved) opening estimation."""
+    name = "opening-improved.book" if improved else "opening.book"
+    return os.path.join(DEFAULT_DIRECTORY, name)
+
+
+def book_key(board, side):
+    """Key of a canonical (white, black) board with `side` to move."""
+    return board[WHITE] | board[BLACK] << NUM_SQUARES | side << 2 * NUM_SQUARES
+
+
+# ---------- Building ----------
+
+def opening_positions(plies):
+    """
+    The canonical (board, side to move) of every position reached from the
+    empty board in at most `plies` placements.
+    """
+    frontier = {((0, 0), WHITE)}
+    found = set(frontier)
+    for _ in range(plies):
+        reached = set()
+        for board, side in frontier:
+            moves = generate_add(board) if side == WHITE else generate_add_black(board)
+            for _, target, removed in moves:
+                child = list(board)
+                child[side] |= BIT[target]
+                if removed != NO_SQUARE:
+                    child[1 - side] ^= BIT[removed]
+                entry = (canonical(child)[0], 1 - side)
+                if entry not in found:
+                    found.add(entry)
+                    reached.add(entry)
+        frontier = reached
+    return found
+
+
+def build(path, plies=DEFAULT_PLIES, depth=DEFAULT_DEPTH, improved=False, log=print):
+    """Search the positions of the first `plies` placements and write the book to `path`."""
+    positions = sorted(opening_positions(plies), key=lambda entry: book_key(*entry))
+    engine = Engine(OPENING, improved=improved)
+    records = []
+    start = time.perf_counter()
+    for n, (board, side) in enumerate(positions, 1):
+        # Entries of earlier roots, searched deeper than this one's subtrees,
+        # would leak into its estimate: each position starts from an empty
+        # table, as a fresh search of it would.
+        engine.transposition_table.clear()
+        engine.new_search()
+        best_move, _, estimate = engine.search(Position(board, side), depth)
+        if best_move is not None:
+            origin, target, removed = best_move
+            records.append(_RECORD.pack(book_key(board, side), estimate,
+                                        origin + 1, target, removed + 1, depth))
+        if n % 100 == 0 or n == len(positions):
+            log(f"{n} of {len(positions)} positions, {time.perf_counter() - start:.1f} s")
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    write_file(path, _HEADER.pack(MAGIC, VERSION, int(improved), plies, len(records)),
+               b"".join(records))
+
+
+# ---------- Probing ----------
+
+class OpeningBook:
+    """
+    A book file, mapped.  improved tells which estimation it was searched
+    with; probe() answers for the positions it covers.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        (_, _, improved, plies, count), self.map = map_file(
+            path, _HEADER, MAGIC, VERSION, "an opening book",
+            lambda fields: HEADER_SIZE + fields[4] * _RECORD.size)
+        self.improved = bool(improved)
+        self.plies = plies
+        self.count = count
+
+    def __len__(self):
+        return self.count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.map.close()
+
+    def probe(self, board, side):
+        """
+        (best_move, estimate, depth) of `board` with `side` to move, the
+        move mapped onto `board`, or None when the book does not cover it.
+        """
+        image, g = canonical(board)
+        key = book_key(image, side)
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if struct.unpack_from("<Q", self.map, HEADER_SIZE + mid * _RECORD.size)[0] < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo == self.count:
+            return None
+        found, estimate, origin, target, removed, depth = _RECORD.unpack_from(
+            self.map, HEADER_SIZE + lo * _RECORD.size)
+        if found != key:
+            return None
+        move = transform_move((origin - 1, target, removed - 1), INVERSES[g])
+        return move, estimate, depth
+
+    def entries(self):
+        """(board, side, best_move, estimate, depth) of every position, in key order."""
+        mask = (1 << NUM_SQUARES) - 1
+        for i in range(self.count):
+            key, estimate, origin, target, removed, depth = _RECORD.unpack_from(
+                self.map, HEADER_SIZE + i * _RECORD.size)
+            board = (key & mask, key >> NUM_SQUARES & mask)
+            yield board, key >> 2 * NUM_SQUARES, (origin - 1, target, removed - 1), estimate, depth
+
+
+def verify(book, log=print):
+    """
+    Search every position of `book` again with a fresh engine at its depth;
+    log the entries whose estimate differs and return how many there are.
+    """
+    mismatches = 0
+    for board, side, _, estimate, depth in book.entries():
+        _, _, searched = Engine(OPENING, improved=book.improved).search(Position(board, side), depth)
+        if searched != estimate:
+            mismatches += 1
+            log(f"{to_string(board)} {'Black' if side == BLACK else 'White'} to move: "
+                f"book {estimate}, search {searched} at depth {depth}")
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or probe the opening book.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build_parser = commands.add_parser("build", help="search the first placements")
+    build_parser.add_argument("--plies", type=int, default=DEFAULT_PLIES,
+                              help=f"placements from the empty board to cover (default {DEFAULT_PLIES})")
+    build_parser.add_argument("--depth", type=int, default=DEFAULT_DEPTH,
+                              help=f"alpha-beta depth of each search (default {DEFAULT_DEPTH})")
+    build_parser.add_argument("--improved", action="store_true",
+                              help="search with the improved opening estimation")
+    build_parser.add_argument("--file", help="book to write (default: books/opening.book, "
+                                             "or books/opening-improved.book with --improved)")
+    probe_parser = commands.add_parser("probe", help="look up one position")
+    probe_parser.add_argument("board")
+    probe_parser.add_argument("--black", action="store_true", help="Black is to move")
+    probe_parser.add_argument("--file", default=default_path())
+    verify_parser = commands.add_parser("verify", help="search every position again")
+    verify_parser.add_argument("--file", default=default_path())
+    args = parser.parse_args()
+
+    if args.command == "build":
+        if not 0 <= args.plies <= 255 or not 1 <= args.depth <= 255:
+            parser.error("--plies must be 0 to 255 and --depth 1 to 255")
+        build(args.file or default_path(args.improved), args.plies, args.depth, args.improved)
+        return
+
+    if args.command == "verify":
+        with OpeningBook(args.file) as book:
+            mismatches = verify(book)
+            print(f"{mismatches} of {len(book)} entries differ from a fresh search")
+        if mismatches:
+            sys.exit(1)
+        return
+
+    if len(args.board) != NUM_SQUARES or set(args.board) - set("WBx"):
+        parser.error("the board must be 21 characters of 'W', 'B' and 'x'")
+    side = BLACK if args.black else WHITE
+    with OpeningBook(args.file) as book:
+        entry = book.probe(from_string(args.board), side)
+    if entry is None:
+        print(f"{args.board}: not in the book")
+    else:
+        best_move, estimate, depth = entry
+        print(f"{args.board}: {format_move(best_move)}, estimate {estimate} at depth {depth}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,304 @@
+"""
+Command line front end shared by the top-level scripts.
+
+Every script is one configuration of the engine (phase, algorithm, side to
+move, estimation) and calls run() with it; argument parsing, file handling
+and the printed report live here once instead of in eight copies.
+
+MINIMAX scripts:
+    python3 <script> <input_file> <output_file> <depth> [--book [<file>]]
+Alpha–beta scripts:
+    python3 <script> <input_file> <output_file> <depth> [--time-ms <ms>] [--no-ordering]
+                                                        [--tt-replacement depth|always]
+                                                        [--workers <n> | --smp <n>]
+                                                        [--quiescence] [--pvs | --mtdf]
+                                                        [--tablebase [<dir>]] [--symmetry]
+                                                        [--book [<file>]]
+                                                        [--phased [--in-hand <w> <b>]]
+
+--tablebase only applies to the midgame scripts; --book (the opening book
+of morris/book.py) and --phased only to the opening scripts.  With
+--phased the search follows the pieces each side has left to place
+(PIECES_PER_SIDE less the pieces on the board, or --in-hand) into the
+midgame, instead of placing pieces to the end of the search.  A position the book
+covers, searched there at least as deep as asked, is answered from it
+without a search.
+"""
+
+import argparse
+import sys
+
+from morris.board import PIECES_PER_SIDE, WHITE, from_string, pieces_in_hand, to_string
+from morris.position import Position, format_move
+from morris.search import Engine, ALPHABETA, GAME, OPENING, PHASED, PVS, MTDF
+from morris.ttable import REPLACEMENTS
+
+# The opening book, the tablebases and the parallel searches are imported
+# where an option asks for them, so a plain search does not pay for loading
+# them (and multiprocessing).
+
+MINIMAX = 'minimax'
+
+
+def read_board(input_file):
+    """Read the board string from the first line of input_file, or exit."""
+    with open(input_file, "r") as f:
+        board_string = f.readline().strip()
+
+    # Simple validation
+    if len(board_string) != 21:
+        print("Error: Board position must be exactly 21 characters long.")
+        sys.exit(1)
+
+    return board_string
+
+
+def write_board(output_file, best_board):
+    with open(output_file, "w") as f:
+        f.write(best_board)
+
+
+def run(script, phase, algorithm, side=WHITE, improved=False):
+    """Entry point of one script; see the module docstring for its arguments."""
+    if algorithm == MINIMAX:
+        run_minimax(script, phase, side, improved)
+    elif algorithm == ALPHABETA:
+        run_alphabeta(script, phase, side, improved)
+    else:
+        raise ValueError(f"unknown algorithm: {algorithm!r}")
+
+
+def probe_book(path, improved, position, depth):
+    """
+    (best_move, estimate, depth) of `position` from the opening book at
+    `path`, or None unless the book covers it at `depth` or deeper.  Raises
+    ValueError when the book cannot be used.
+    """
+    from morris.book import OpeningBook
+
+    try:
+        book = OpeningBook(path)
+    except OSError:
+        raise ValueError(f"no opening book at {path} (build one with python3 -m morris.book build)")
+    with book:
+        if book.improved != improved:
+            estimation = "improved" if book.improved else "handout"
+            raise ValueError(f"{path} was searched with the {estimation} estimation")
+        entry = book.probe(position.board(), position.side)
+    if entry is None or (depth is not None and depth > entry[2]):
+        return None
+    return entry
+
+
+def book_report(entry):
+    """The report line of a book probe."""
+    if entry is None:
+        return "Opening book: not covered."
+    return f"Opening book: searched to depth {entry[2]}."
+
+
+def run_minimax(script, phase, side, improved):
+    arguments = sys.argv[1:]
+    book_path = None
+    if phase == OPENING and len(arguments) in (4, 5) and arguments[3] == "--book":
+        if len(arguments) == 5:
+            book_path = arguments[4]
+        else:
+            from morris.book import default_path
+            book_path = default_path(improved)
+        arguments = arguments[:3]
+
+    # Ensure correct number of arguments
+    if len(arguments) != 3:
+        book_usage = " [--book [<file>]]" if phase == OPENING else ""
+        print(f"Usage: python3 {script} <input_file> <output_file> <depth>{book_usage}")
+        sys.exit(1)
+
+    input_file = arguments[0]
+    output_file = arguments[1]
+    try:
+        depth = int(arguments[2])
+    except ValueError:
+        print("Depth must be an integer.")
+        sys.exit(1)
+
+    position = Position(from_string(read_board(input_file)), side)
+    engine = Engine(phase, improved=improved)
+
+    book_entry = None
+    if book_path is not None:
+        try:
+            book_entry = probe_book(book_path, improved, position, depth)
+        except ValueError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+
+    if book_entry is not None:
+        best_move, estimate, _ = book_entry
+        nodes_evaluated = 0
+    else:
+        # MAX search when White is to move, MIN search when Black is
+        best_move, nodes_evaluated, estimate = engine.minimax(position, depth)
+
+    position.make_move(best_move)
+    best_board = to_string(position.bits)
+    write_board(output_file, best_board)
+
+    # Print output as per project format
+    print(f"Board Position: {best_board}")
+    print(f"Positions evaluated by static estimation: {nodes_evaluated}.")
+    if book_path is not None:
+        print(book_report(book_entry))
+    print(f"MINIMAX estimate: {estimate}.")
+
+
+def alphabeta_parser(script):
+    """Argument parser of the alpha–beta scripts."""
+    parser = argparse.ArgumentParser(
+        usage=f"python3 {script} <input_file> <output_file> <depth> [--time-ms <ms>]")
+    parser.add_argument("input_file")
+    parser.add_argument("output_file")
+    parser.add_argument("depth", type=int, nargs="?",
+                        help="search depth (the maximum depth when --time-ms is given)")
+    parser.add_argument("--time-ms", type=int,
+                        help="search by iterative deepening within this many milliseconds")
+    parser.add_argument("--no-ordering", action="store_true",
+                        help="search children in generation order (as in the handout)")
+    parser.add_argument("--tt-replacement", choices=REPLACEMENTS, default="depth",
+                        help="transposition table replacement policy: keep the deeper entry "
+                             "(default) or always overwrite")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="split the root moves across this many processes")
+    parser.add_argument("--smp", type=int, default=0, metavar="HELPERS",
+                        help="Lazy SMP: run this many helper searches sharing the transposition table")
+    parser.add_argument("--quiescence", action="store_true",
+                        help="extend the leaves with a search of mill-closing moves")
+    variant = parser.add_mutually_exclusive_group()
+    variant.add_argument("--pvs", action="store_true",
+                         help="principal variation search (null windows after the first child)")
+    variant.add_argument("--mtdf", action="store_true",
+                         help="MTD(f): a series of null-window searches converging on the value")
+    parser.add_argument("--tablebase", nargs="?", const="", metavar="DIR",
+                        help="probe the endgame tables built by morris.tablebase "
+                             "(midgame scripts only; default directory: tablebases/)")
+    parser.add_argument("--symmetry", action="store_true",
+                        help="share transposition table entries between mirror-image positions")
+    parser.add_argument("--book", nargs="?", const="", metavar="FILE",
+                        help="answer from the opening book built by morris.book when it covers "
+                             "the position (opening scripts only; default: books/opening.book)")
+    parser.add_argument("--phased", action="store_true",
+                        help="carry the search from placement into the midgame when the pieces "
+                             "in hand run out (opening scripts only)")
+    parser.add_argument("--in-hand", type=int, nargs=2, metavar=("W", "B"),
+                        help=f"pieces White and Black have left to place with --phased "
+                             f"(default: {PIECES_PER_SIDE} less the pieces on the board)")
+    return parser
+
+
+def run_alphabeta(script, phase, side, improved):
+    parser = alphabeta_parser(script)
+    args = parser.parse_args()
+
+    if args.depth is None and args.time_ms is None:
+        parser.error("a depth or a --time-ms budget is required")
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.workers > 1 and args.time_ms is not None:
+        parser.error("--workers needs a fixed depth, not --time-ms")
+    if args.smp < 0:
+        parser.error("--smp must not be negative")
+    if args.smp and args.workers > 1:
+        parser.error("--smp and --workers cannot be combined")
+    if args.mtdf and args.workers > 1:
+        parser.error("--mtdf and --workers cannot be combined")
+    if args.tablebase is not None and phase != GAME:
+        parser.error("--tablebase only applies to the midgame")
+    if args.book is not None and phase != OPENING:
+        parser.error("--book only applies to the opening")
+    if args.phased and phase != OPENING:
+        parser.error("--phased only applies to the opening")
+    if args.phased and args.book is not None:
+        parser.error("--phased and --book cannot be combined")
+    if args.in_hand is not None:
+        if not args.phased:
+            parser.error("--in-hand needs --phased")
+        if not all(0 <= n <= PIECES_PER_SIDE for n in args.in_hand):
+            parser.error(f"--in-hand counts must be 0 to {PIECES_PER_SIDE}")
+
+    # Without a path, --tablebase and --book use the default one.
+    if args.tablebase == "":
+        from morris.tablebase import DEFAULT_DIRECTORY
+        args.tablebase = DEFAULT_DIRECTORY
+    if args.book == "":
+        from morris.book import default_path
+        args.book = default_path(improved)
+
+    depth = args.depth
+    board = from_string(read_board(args.input_file))
+    if args.phased:
+        board += tuple(args.in_hand) if args.in_hand is not None else pieces_in_hand(board)
+        phase = PHASED
+    position = Position(board, side)
+    engine = Engine(phase, improved=improved, ordering=not args.no_ordering,
+                    replacement=args.tt_replacement, quiescence=args.quiescence,
+                    variant=PVS if args.pvs else MTDF if args.mtdf else ALPHABETA,
+                    tablebase=args.tablebase, symmetry=args.symmetry)
+
+    book_entry = None
+    if args.book is not None:
+        try:
+            book_entry = probe_book(args.book, improved, position, depth)
+        except ValueError as e:
+            parser.error(str(e))
+
+    # Run Alpha–Beta pruning instead of standard Minimax
+    helper_nodes = None
+    if book_entry is not None:
+        best_move, estimate, depth = book_entry
+        nodes_evaluated = 0
+    elif args.workers > 1:
+        from morris.parallel import ParallelRootSearch
+        with ParallelRootSearch(engine, args.workers) as parallel:
+            best_move, nodes_evaluated, estimate = parallel.search(position, depth)
+    elif args.smp:
+        from morris.smp import LazySMPSearch
+        with LazySMPSearch(engine, args.smp) as smp:
+            best_move, nodes_evaluated, estimate, depth = smp.search(
+                position, depth, budget_ms=args.time_ms)
+            helper_nodes = smp.helper_nodes
+    elif args.time_ms is None:
+        best_move, nodes_evaluated, estimate = engine.search(position, depth)
+    else:
+        best_move, nodes_evaluated, estimate, depth = engine.deepen(
+            position, args.time_ms, max_depth=depth)
+
+    position.make_move(best_move)
+    best_board = to_string(position.bits)
+    write_board(args.output_file, best_board)
+
+    transposition_table = engine.transposition_table
+    move_orderer = engine.move_orderer
+
+    # Print output as per project format
+    print(f"Board Position: {best_board}")
+    print(f"Best move: {format_move(best_move)}.")
+    print(f"Positions evaluated by static estimation: {nodes_evaluated}.")
+    if helper_nodes is not None:
+        print(f"Positions evaluated by helper searches: {helper_nodes}.")
+    if args.time_ms is not None:
+        print(f"Depth completed within {args.time_ms} ms: {depth}.")
+    if args.quiescence:
+        print(f"Quiescence nodes: {engine.quiescence_nodes}.")
+    if args.mtdf:
+        print(f"MTD(f) null-window passes: {engine.mtdf_passes}.")
+    if args.tablebase is not None:
+        print(f"Tablebase hits: {engine.tablebase_hits}.")
+    if args.book is not None:
+        print(book_report(book_entry))
+    if args.phased:
+        print(f"Pieces in hand after the move: White {position.bits[2]}, Black {position.bits[3]}.")
+    print(f"Transposition table hit rate: {100 * transposition_table.hit_rate():.1f}% "
+          f"({transposition_table.hits} of {transposition_table.probes} probes).")
+    print(f"Cut-on-first-move rate: {100 * move_orderer.first_move_cutoff_rate():.1f}% "
+          f"({move_orderer.first_move_cutoffs} of {move_orderer.cutoffs} cutoffs).")
+    print(f"Alpha-Beta estimate: {estimate}.")
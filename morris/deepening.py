@@ -0,0 +1,89 @@
+"""
+Iterative deepening under a wall-clock budget.
+
+The driver runs the alpha–beta search at depth 1, 2, 3, ... and keeps the
+result of the last iteration that finished.  The searches call
+SearchClock.tick() at every node; once the deadline has passed tick() raises
+SearchTimeout, which unwinds the unfinished iteration.
+"""
+
+import time
+
+
+class SearchTimeout(Exception):
+    """Raised from inside the search when the time budget is used up."""
+
+
+class SearchClock:
+    """
+    Deadline shared by the search functions of one script.
+    The clock is only read every CHECK_EVERY ticks to keep tick() cheap.
+    """
+
+    CHECK_EVERY = 8
+
+    def __init__(self):
+        self.deadline = None
+        self.countdown = self.CHECK_EVERY
+
+    def start(self, budget_ms):
+        self.deadline = time.perf_counter() + budget_ms / 1000
+        self.countdown = self.CHECK_EVERY
+
+    def stop(self):
+        self.deadline = None
+
+    def tick(self):
+        if self.deadline is None:
+            return
+        self.countdown -= 1
+        if self.countdown <= 0:
+            self.countdown = self.CHECK_EVERY
+            if time.perf_counter() >= self.deadline:
+                raise SearchTimeout
+
+
+def iterative_deepening(search, position, clock, budget_ms, max_depth=None, on_iteration=None):
+    """
+    Call search(position, depth, -inf, inf) for depth = 1, 2, ... until the
+    budget runs out or max_depth is done.
+
+    Returns (best_move, nodes_evaluated, estimate, depth) from the last
+    completed iteration; nodes_evaluated is summed over all completed
+    iterations.  Depth 1 always runs to completion (with the clock
+    only armed afterwards) so there is always a move to return.
+
+    An abandoned iteration unwinds without unmaking its moves, so the
+    position is restored from a snapshot before returning.
+
+    on_iteration, if given, is called with (best_move, nodes_evaluated,
+    estimate, depth) after every completed iteration.
+    """
+    start = time.perf_counter()
+    best_move, nodes_evaluated, estimate = search(position, 1, float('-inf'), float('inf'))
+    depth = 1
+    if on_iteration is not None:
+        on_iteration(best_move, nodes_evaluated, estimate, depth)
+
+    if best_move is None:                  # no legal moves: nothing to deepen
+        return best_move, nodes_evaluated, estimate, depth
+
+    bits, side, key = position.bits[:], position.side, position.key
+
+    remaining_ms = budget_ms - (time.perf_counter() - start) * 1000
+    clock.start(remaining_ms)
+    try:
+        while max_depth is None or depth < max_depth:
+            best_move, evaluated, estimate = search(position, depth + 1, float('-inf'), float('inf'))
+            depth += 1
+            nodes_evaluated += evaluated
+            if on_iteration is not None:
+                on_iteration(best_move, nodes_evaluated, estimate, depth)
+    except SearchTimeout:
+        position.bits[:] = bits
+        position.side = side
+        position.key = key
+    finally:
+        clock.stop()
+
+    return best_move, nodes_evaluated, estimate, depth
@@ -0,0 +1,191 @@
+"""
+Static estimation functions from the handout, plus the improved versions.
+
+All of them take a (white, black) board and score it from White's point of
+view; the MIN side of every search simply minimizes the same number.  The
+phased estimations take a board carrying the pieces in hand and pick the
+estimation of the phase the game is in.
+"""
+
+from morris.board import WHITE, BLACK
+from morris.mills import MILL_MASKS
+from morris.movegen import count_moves_game
+
+
+def static_estimation_opening(board):
+    """
+    Static estimation for the opening phase.
+    Returns (numWhitePieces - numBlackPieces) as defined in the handout.
+    """
+    num_white = board[WHITE].bit_count()
+    num_black = board[BLACK].bit_count()
+    return num_white - num_black
+
+
+def static_estimation_game(board):
+    """
+    Static estimation function for the midgame/endgame phase.
+    Evaluates based on piece counts and the number of moves available to Black.
+    """
+    num_white = board[WHITE].bit_count()
+    num_black = board[BLACK].bit_count()
+
+    # Count Black's possible moves (mobility) without generating them
+    num_black_moves = count_moves_game(board, BLACK)
+
+    # Terminal conditions
+    if num_black <= 2:
+        return 10000  # White wins
+    elif num_white <= 2:
+        return -10000  # Black wins
+    elif num_black_moves == 0:
+        return 10000  # Black is trapped (no legal moves)
+    else:
+        return (1000 * (num_white - num_black)) - num_black_moves
+
+
+def improved_static_estimation_opening(board):
+    """
+    Improved evaluation function for the opening phase.
+    Considers:
+      - Piece difference
+      - Potential mills (two-in-a-row + empty)
+      - Completed mills
+    """
+    num_white = board[WHITE].bit_count()
+    num_black = board[BLACK].bit_count()
+
+    white_potentials = count_potential_mills(board[WHITE], board[BLACK])
+    black_potentials = count_potential_mills(board[BLACK], board[WHITE])
+    white_mills = count_mills(board[WHITE])
+    black_mills = count_mills(board[BLACK])
+
+    score = (
+        1000 * (num_white - num_black)
+        + 200 * (white_potentials - black_potentials)
+        + 100 * (white_mills - black_mills)
+    )
+
+    return score
+
+
+def improved_static_estimation_game(board):
+    """
+    Improved static estimation function for the midgame/endgame phase.
+    Incorporates material balance, mobility, mill counts, and potential mills.
+    """
+    num_white = board[WHITE].bit_count()
+    num_black = board[BLACK].bit_count()
+
+    # Count the moves of both sides (mobility) without generating them
+    white_moves = count_moves_game(board, WHITE)
+    black_moves = count_moves_game(board, BLACK)
+
+    # --- Terminal conditions ---
+    if num_black <= 2:
+        return 10000  # White wins
+    elif num_white <= 2:
+        return -10000  # Black wins
+    elif black_moves == 0:
+        return 10000  # Black is trapped (no legal moves)
+
+    # --- Strategic feature calculations ---
+    white_potentials = count_potential_mills(board[WHITE], board[BLACK])
+    black_potentials = count_potential_mills(board[BLACK], board[WHITE])
+    white_mills = count_mills(board[WHITE])
+    black_mills = count_mills(board[BLACK])
+
+    # Combine weighted factors into a single score
+    score = (
+        1000 * (num_white - num_black) +          # Material balance
+        200  * (white_potentials - black_potentials) +  # Future mill potential
+        100  * (white_mills - black_mills) +      # Existing mills
+        5    * (white_moves - black_moves)        # Mobility advantage
+    )
+
+    return score
+
+
+def static_estimation_phased(board):
+    """
+    Static estimation of a board carrying the pieces in hand: the opening
+    estimation while either side has pieces left to place, the midgame one
+    after.  The opening's piece difference is counted in the midgame's
+    units (1000 per piece), so that leaves on both sides of the end of
+    placement compare.
+    """
+    if board[2] or board[3]:
+        return 1000 * static_estimation_opening(board)
+    return static_estimation_game(board)
+
+
+def improved_static_estimation_phased(board):
+    """
+    Improved static estimation of a board carrying the pieces in hand,
+    by phase as in static_estimation_phased (both improved estimations
+    already count 1000 per piece).
+    """
+    if board[2] or board[3]:
+        return improved_static_estimation_opening(board)
+    return improved_static_estimation_game(board)
+
+
+# Default number of boards an EstimationCache remembers.
+DEFAULT_CACHE_ENTRIES = 1 << 18
+
+
+class EstimationCache:
+    """
+    A static estimation that remembers the boards it scored, for engines
+    that search many overlapping positions (the leaves of one search
+    repeat across transpositions, and those of a daemon's searches across
+    requests).  Call it as the estimation itself.  When max_entries boards
+    are stored the cache is emptied and fills again.
+    """
+
+    def __init__(self, estimation, max_entries=DEFAULT_CACHE_ENTRIES):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.estimation = estimation
+        self.max_entries = max_entries
+        self.values = {}
+        self.probes = 0
+        self.hits = 0
+
+    def __call__(self, board):
+        self.probes += 1
+        key = tuple(board)
+        value = self.values.get(key)
+        if value is not None:
+            self.hits += 1
+            return value
+        if len(self.values) >= self.max_entries:
+            self.values.clear()
+        value = self.values[key] = self.estimation(board)
+        return value
+
+
+def count_potential_mills(own, opponent):
+    """
+    Counts the number of two-in-a-row configurations (potential mills)
+    where the third position is empty, over every mill of the board
+    (including the diagonal mills).
+    own/opponent are the bitboards of the counted color and of the other color.
+    """
+    count = 0
+    for mask in MILL_MASKS:
+        if (own & mask).bit_count() == 2 and not opponent & mask:
+            count += 1
+    return count
+
+
+def count_mills(own):
+    """
+    Counts the number of complete mills (three in a row)
+    currently on the board for the color whose bitboard is `own`.
+    """
+    count = 0
+    for mask in MILL_MASKS:
+        if own & mask == mask:
+            count += 1
+    return count
@@ -0,0 +1,139 @@
+"""
+Perfect indexing of board placements, for tables stored by position.
+
+The boards with w White and b Black pieces are numbered 0 .. count(w, b) - 1
+without gaps: White's pieces are ranked among the C(21, w) ways to place
+them, and Black's among the C(21 - w, b) ways to place them on the points
+White left empty.  Each rank is the colexicographic rank of the set of
+points, sum(C(p_k, k)) over the pieces' points p_1 < p_2 < ... (numbered
+0 .. 20 on the board of neighbors(), Black's on the empty points only).
+
+    index = rank(white) * C(21 - w, b) + rank(black among the empty points)
+
+The symmetric numbering (count_symmetric, rank_symmetric) counts each
+position once up to the board's symmetries (morris/symmetry.py): a board
+is first mapped to its canonical form, and White's placement is then
+numbered among the canonical placements only, in order of rank.  About a
+quarter as many indexes; those of boards whose canonical form has another
+Black placement (White's placement being symmetric itself) go unused.
+
+    index = class(white) * C(21 - w, b) + rank(black among the empty points)
+"""
+
+from math import comb
+
+from morris.board import ALL_SQUARES, BIT, NUM_SQUARES
+from morris.symmetry import canonical, canonical_set
+
+# BINOMIAL[n][k] == C(n, k) for the n and k a board needs.
+BINOMIAL = tuple(tuple(comb(n, k) for k in range(NUM_SQUARES + 2)) for n in range(NUM_SQUARES + 1))
+
+
+def count(white_count, black_count):
+    """Number of boards with that many White and Black pieces."""
+    return BINOMIAL[NUM_SQUARES][white_count] * BINOMIAL[NUM_SQUARES - white_count][black_count]
+
+
+def rank_set(bits):
+    """Colexicographic rank of `bits` among the sets with as many points."""
+    r = 0
+    k = 0
+    while bits:
+        bit = bits & -bits
+        bits ^= bit
+        k += 1
+        r += BINOMIAL[bit.bit_length() - 1][k]
+    return r
+
+
+def unrank_set(r, size):
+    """The set of `size` points with colexicographic rank r."""
+    bits = 0
+    for k in range(size, 0, -1):
+        point = k - 1
+        while BINOMIAL[point + 1][k] <= r:
+            point += 1
+        r -= BINOMIAL[point][k]
+        bits |= BIT[point]
+    return bits
+
+
+def _rank_black(white, black):
+    """Rank of Black's points renumbered among the points White left empty."""
+    r = 0
+    k = 0
+    while black:
+        bit = black & -black
+        black ^= bit
+        k += 1
+        r += BINOMIAL[bit.bit_length() - 1 - (white & (bit - 1)).bit_count()][k]
+    return r
+
+
+def _spread_black(white, compact):
+    """Inverse of _rank_black's renumbering: `compact` back on the empty points."""
+    black = 0
+    empty = ALL_SQUARES & ~white
+    while compact:
+        bit = empty & -empty
+        empty ^= bit
+        if compact & 1:
+            black |= bit
+        compact >>= 1
+    return black
+
+
+def rank_board(white, black):
+    """Index of the board (white, black) among count(its piece counts)."""
+    return (rank_set(white) * BINOMIAL[NUM_SQUARES - white.bit_count()][black.bit_count()]
+            + _rank_black(white, black))
+
+
+def unrank_board(index, white_count, black_count):
+    """The board (white, black) with that index; inverse of rank_board()."""
+    white_rank, black_rank = divmod(index, BINOMIAL[NUM_SQUARES - white_count][black_count])
+    white = unrank_set(white_rank, white_count)
+    return white, _spread_black(white, unrank_set(black_rank, black_count))
+
+
+# ---------- Up to symmetry ----------
+
+# pieces -> (canonical placements by rank, their class numbers by rank)
+_CLASSES = {}
+
+
+def _classes(pieces):
+    classes = _CLASSES.get(pieces)
+    if classes is None:
+        placements = []
+        numbers = {}
+        for r in range(BINOMIAL[NUM_SQUARES][pieces]):
+            bits = unrank_set(r, pieces)
+            if canonical_set(bits) == bits:
+                numbers[r] = len(placements)
+                placements.append(bits)
+        classes = _CLASSES[pieces] = (tuple(placements), numbers)
+    return classes
+
+
+def count_symmetric(white_count, black_count):
+    """Number of symmetric indexes of the boards with those piece counts."""
+    return len(_classes(white_count)[0]) * BINOMIAL[NUM_SQUARES - white_count][black_count]
+
+
+def rank_symmetric(white, black):
+    """Symmetric index of the board (white, black): the same for all its images."""
+    (white, black), _ = canonical((white, black))
+    number = _classes(white.bit_count())[1][rank_set(white)]
+    return (number * BINOMIAL[NUM_SQUARES - white.bit_count()][black.bit_count()]
+            + _rank_black(white, black))
+
+
+def unrank_symmetric(index, white_count, black_count):
+    """
+    A board with that symmetric index, White's placement canonical.  Its
+    own canonical form has the same index unless the index is unused.
+    """
+    number, black_rank = divmod(index, BINOMIAL[NUM_SQUARES - white_count][black_count])
+    white = _classes(white_count)[0][number]
+    return white, _spread_black(white, unrank_set(black_rank, black_count))
@@ -0,0 +1,316 @@
+"""
+Move generation for the Morris Variant.
+
+Every generator takes a (white, black) board and the side to move and
+returns moves rather than child positions: (origin, target, removed) tuples
+of board indices, with NO_SQUARE for a placement's origin or for no removal.
+The searches apply them in place with Position.make_move / unmake_move
+(morris/position.py).  Moves come out in the handout's order: pieces and
+targets by increasing index, neighbors in neighbors() order, removals last.
+"""
+
+from morris.board import ALL_SQUARES, BIT, BLACK, NEIGHBORS, NEIGHBOR_MASKS, NO_SQUARE, WHITE
+from morris.mills import MILL_PAIRS, close_mill, mill_members
+
+
+def generate_moves_opening(board, side=WHITE):
+    """
+    Wrapper function defined in the Morris Variant handout.
+    Returns all possible opening moves for `side` (White by default).
+    """
+    return generate_add(board, side)
+
+
+def generate_moves_opening_black(board):
+    """
+    Wrapper function defined in the Morris Variant handout.
+    Returns all possible opening moves for Black.
+    """
+    return generate_add(board, BLACK)
+
+
+def generate_add(board, side=WHITE):
+    """
+    Generate all moves placing a piece of `side` on an empty point
+    (opening phase).
+    """
+    return list(iter_add(board, side))
+
+
+def generate_add_black(board):
+    """
+    Generates all possible opening moves for Black.
+    The generators read the mover's and the opponent's bitboards by side,
+    so unlike the handout's version no color swapping is needed.
+    """
+    return list(iter_add(board, BLACK))
+
+
+def generate_moves_game(board, side=WHITE):
+    """
+    Generate all possible moves for `side` (White by default) in the midgame/endgame.
+
+    Rules from the handout:
+    - If the side has 3 pieces left, it can 'hop' (move any piece to any empty point).
+    - Otherwise, it can only move a piece to an adjacent empty neighbor.
+    """
+    return list(iter_moves_game(board, side))
+
+
+def generate_moves_game_black(board):
+    """
+    Generates all possible moves for Black in the midgame/endgame phase
+    (no color swapping, see generate_add_black).
+    """
+    return list(iter_moves_game(board, BLACK))
+
+
+def generate_move(board, side=WHITE):
+    """
+    Generate all possible moves for `side` in the midgame phase (sliding pieces).
+    A piece can move to any adjacent empty position.
+    """
+    return list(iter_move(board, side))
+
+
+def generate_hopping(board, side=WHITE):
+    """
+    Generate all possible moves for `side` in the endgame (hopping phase).
+    With exactly 3 pieces left, a piece can move to any empty location.
+    """
+    return list(iter_hopping(board, side))
+
+
+def generate_moves_phased(board, side=WHITE):
+    """
+    Generate all moves for `side` on a board carrying the pieces in hand,
+    (white, black, white_in_hand, black_in_hand): placements (generate_add)
+    while `side` has pieces left to place, then the midgame/endgame moves
+    (generate_move, or generate_hopping with 3 pieces left).
+    """
+    return list(iter_moves_phased(board, side))
+
+
+def generate_remove(opponent, origin, target, L):
+    """
+    Appends to L one move (origin, target, removed) for every opponent piece
+    that may be removed after the mover closed a mill on target.
+    If all opponent pieces are in mills, appends the move without a removal.
+    """
+    L.extend(iter_remove(opponent, origin, target))
+
+
+# ---------- Streaming generators ----------
+#
+# The generate_* functions above build complete lists.  The iter_* versions
+# yield the same moves in the same order, one at a time, so a search that
+# cuts after the first few children never generates the rest (including
+# every removal variant of a mill-closing move).
+
+def iter_moves_opening(board, side=WHITE):
+    """Streaming generate_moves_opening()."""
+    return iter_add(board, side)
+
+
+def iter_moves_opening_black(board):
+    """Streaming generate_moves_opening_black()."""
+    return iter_add(board, BLACK)
+
+
+def iter_add(board, side=WHITE):
+    """Streaming generate_add()."""
+    own = board[side]
+    opponent = board[1 - side]
+    empty = ALL_SQUARES & ~(own | opponent)
+
+    while empty:
+        bit = empty & -empty
+        empty ^= bit
+        target = bit.bit_length() - 1
+
+        if close_mill(target, own | bit):
+            yield from iter_remove(opponent, NO_SQUARE, target)
+        else:
+            yield (NO_SQUARE, target, NO_SQUARE)
+
+
+def iter_add_black(board):
+    """Streaming generate_add_black()."""
+    return iter_add(board, BLACK)
+
+
+def iter_moves_game(board, side=WHITE):
+    """Streaming generate_moves_game()."""
+    if board[side].bit_count() == 3:
+        return iter_hopping(board, side)
+    else:
+        return iter_move(board, side)
+
+
+def iter_moves_game_black(board):
+    """Streaming generate_moves_game_black()."""
+    return iter_moves_game(board, BLACK)
+
+
+def iter_moves_phased(board, side=WHITE):
+    """Streaming generate_moves_phased()."""
+    if board[2 + side]:
+        return iter_add(board, side)
+    return iter_moves_game(board, side)
+
+
+def iter_move(board, side=WHITE):
+    """Streaming generate_move()."""
+    own = board[side]
+    opponent = board[1 - side]
+    occupied = own | opponent
+
+    pieces = own
+    while pieces:
+        src = pieces & -pieces
+        pieces ^= src
+        origin = src.bit_length() - 1
+        for target in NEIGHBORS[origin]:
+            dst = BIT[target]
+            if not occupied & dst:
+                if close_mill(target, own ^ src ^ dst):
+                    yield from iter_remove(opponent, origin, target)
+                else:
+                    yield (origin, target, NO_SQUARE)
+
+
+def iter_hopping(board, side=WHITE):
+    """Streaming generate_hopping()."""
+    own = board[side]
+    opponent = board[1 - side]
+    empty = ALL_SQUARES & ~(own | opponent)
+
+    pieces = own
+    while pieces:
+        src = pieces & -pieces
+        pieces ^= src
+        origin = src.bit_length() - 1
+        targets = empty
+        while targets:
+            dst = targets & -targets
+            targets ^= dst
+            target = dst.bit_length() - 1
+
+            if close_mill(target, own ^ src ^ dst):
+                yield from iter_remove(opponent, origin, target)
+            else:
+                yield (origin, target, NO_SQUARE)
+
+
+def iter_remove(opponent, origin, target):
+    """Streaming generate_remove()."""
+    removable = opponent & ~mill_members(opponent)
+
+    # If no opponent pieces were removable (all in mills)
+    if not removable:
+        yield (origin, target, NO_SQUARE)
+
+    while removable:
+        bit = removable & -removable
+        removable ^= bit
+        yield (origin, target, bit.bit_length() - 1)
+
+
+# ---------- Mobility counting ----------
+#
+# The static estimations only need the number of moves, not the moves.
+# These count_* functions return exactly len(generate_*(board, side))
+# without building any move.  Every mill-closing move fans out into one
+# move per removable opponent piece, and that number only depends on the
+# opponent's pieces, so it is computed once per position.
+
+def count_removals(opponent):
+    """
+    Number of moves a single mill-closing move expands into: one per
+    opponent piece outside a mill, or 1 when every piece is in a mill.
+    """
+    return (opponent & ~mill_members(opponent)).bit_count() or 1
+
+
+def count_moves_opening(board, side=WHITE):
+    """Same as len(generate_moves_opening(board, side))."""
+    return count_add(board, side)
+
+
+def count_add(board, side=WHITE):
+    """Same as len(generate_add(board, side))."""
+    own = board[side]
+    empty = ALL_SQUARES & ~(own | board[1 - side])
+    count = empty.bit_count()
+
+    removals = 0
+    while empty:
+        bit = empty & -empty
+        empty ^= bit
+        if close_mill(bit.bit_length() - 1, own | bit):
+            if not removals:
+                removals = count_removals(board[1 - side])
+            count += removals - 1
+
+    return count
+
+
+def count_moves_game(board, side=WHITE):
+    """Same as len(generate_moves_game(board, side))."""
+    own = board[side]
+    empty = ALL_SQUARES & ~(own | board[1 - side])
+    if own.bit_count() == 3:
+        return _count_moves_to(board, side, empty, None)
+    else:
+        return _count_moves_to(board, side, empty, NEIGHBOR_MASKS)
+
+
+def count_move(board, side=WHITE):
+    """Same as len(generate_move(board, side))."""
+    empty = ALL_SQUARES & ~(board[WHITE] | board[BLACK])
+    return _count_moves_to(board, side, empty, NEIGHBOR_MASKS)
+
+
+def count_hopping(board, side=WHITE):
+    """Same as len(generate_hopping(board, side))."""
+    empty = ALL_SQUARES & ~(board[WHITE] | board[BLACK])
+    return _count_moves_to(board, side, empty, None)
+
+
+def _count_moves_to(board, side, empty, source_masks):
+    """
+    Count moves of `side` onto the empty points.  The pieces that can reach
+    target j are own & source_masks[j] (adjacent pieces), or every own piece
+    when source_masks is None (hopping).  A move from s closes a mill on j
+    when some mill pair of j is fully occupied by own pieces other than s.
+    """
+    own = board[side]
+    count = 0
+    removals = 0
+
+    while empty:
+        bit = empty & -empty
+        empty ^= bit
+        j = bit.bit_length() - 1
+        sources = own if source_masks is None else own & source_masks[j]
+        if not sources:
+            continue
+
+        full_pairs = [pair for pair in MILL_PAIRS[j] if own & pair == pair]
+        if not full_pairs:
+            count += sources.bit_count()
+            continue
+
+        if not removals:
+            removals = count_removals(board[1 - side])
+        while sources:
+            src = sources & -sources
+            sources ^= src
+            for pair in full_pairs:
+                if not pair & src:
+                    count += removals
+                    break
+            else:
+                count += 1
+
+    return count
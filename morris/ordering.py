@@ -0,0 +1,153 @@
+"""
+Move ordering for the alpha–beta searches.
+
+Alpha–beta prunes the most when the best child is searched first, so before
+looping over the children a node asks the MoveOrderer to sort them:
+
+  1. the hash move (best move stored in the transposition table)
+  2. mill-closing moves that remove an opponent piece
+  3. killer moves: quiet moves that caused a cut at the same ply elsewhere
+  4. everything else by history score (how often and how deep the move
+     caused a cut anywhere in the tree)
+
+The ordering consumes the streaming iter_* generators, so children that a
+cut makes unnecessary are never generated.
+
+Killer and history entries are keyed by a move's (origin, target), so a
+move that refuted one line is tried early in sibling lines as well.
+"""
+
+from morris.board import BIT, NO_SQUARE, NUM_SQUARES
+
+MAX_PLY = 128
+
+KILLER_SCORE = 1 << 31
+
+
+def _playable(board, side, move):
+    """
+    Cheap sanity check of a hash move against the current board: the mover
+    owns the origin, the target is empty and the removed piece exists.
+    (A matching 64-bit key makes anything else practically impossible.)
+    """
+    origin, target, removed = move
+    own = board[side]
+    if (own | board[1 - side]) & BIT[target]:
+        return False
+    if origin != NO_SQUARE and not own & BIT[origin]:
+        return False
+    if removed != NO_SQUARE and not board[1 - side] & BIT[removed]:
+        return False
+    return True
+
+
+def move_key(move):
+    """
+    Return a small integer identifying the (origin, target) of a move.
+    Placements (origin NO_SQUARE == -1) get keys 0..20.
+    """
+    return (move[0] + 1) * NUM_SQUARES + move[1]
+
+
+class MoveOrderer:
+    """
+    Pluggable ordering layer; each heuristic can be switched off on its own
+    (with all of them off, children keep their generation order).
+
+    Statistics for judging the ordering:
+      cutoffs             -- nodes that ended in a cut
+      first_move_cutoffs  -- of those, nodes whose first child caused it
+    """
+
+    def __init__(self, hash_move=True, captures=True, killers=True, history=True):
+        self.use_hash_move = hash_move
+        self.use_captures = captures
+        self.use_killers = killers
+        self.use_history = history
+        self.clear()
+
+    def clear(self):
+        self.killers = [[None, None] for _ in range(MAX_PLY)]
+        self.history = [[0] * ((NUM_SQUARES + 1) * NUM_SQUARES) for _ in range(2)]
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0
+
+    def new_search(self):
+        """Forget killers and age the history scores between searches."""
+        self.killers = [[None, None] for _ in range(MAX_PLY)]
+        for table in self.history:
+            for i, score in enumerate(table):
+                table[i] = score >> 1
+
+    def order(self, board, moves, side, ply, hash_move=None):
+        """
+        Yield `moves` (an iterator) for side `side` at `ply` best-first.
+
+        Generation stays lazy as far as the ordering allows: the hash move
+        is yielded before the generator is even started, and captures are
+        passed through as soon as they are generated.  Only the quiet moves
+        are collected, then sorted by killer and history score once the
+        generator is exhausted.  The sort is stable, so equally scored
+        moves keep generation order.
+        """
+        if self.use_hash_move and hash_move is not None and _playable(board, side, hash_move):
+            yield hash_move
+        else:
+            hash_move = None
+
+        if not (self.use_captures or self.use_killers or self.use_history):
+            for move in moves:
+                if move != hash_move:
+                    yield move
+            return
+
+        use_captures = self.use_captures
+        quiet = []
+        for move in moves:
+            if move == hash_move:
+                continue
+            if use_captures and move[2] != NO_SQUARE:
+                yield move
+            else:
+                quiet.append(move)
+
+        if len(quiet) > 1:
+            killers = self.killers[ply] if self.use_killers and ply < MAX_PLY else ()
+            history = self.history[side] if self.use_history else None
+
+            def score(move):
+                key = (move[0] + 1) * NUM_SQUARES + move[1]
+                bonus = history[key] if history is not None else 0
+                if key in killers:
+                    return KILLER_SCORE + bonus
+                return bonus
+
+            quiet.sort(key=score, reverse=True)
+
+        yield from quiet
+
+    def record_cutoff(self, move, side, ply, depth, index):
+        """
+        Update the heuristics after `move`, the index-th move searched,
+        caused a cut at a node of remaining depth `depth`.
+        """
+        self.cutoffs += 1
+        if index == 0:
+            self.first_move_cutoffs += 1
+
+        if move[2] != NO_SQUARE:
+            return                         # captures are ordered first anyway
+
+        key = move_key(move)
+        if ply < MAX_PLY:
+            killers = self.killers[ply]
+            if killers[0] != key:
+                killers[1] = killers[0]
+                killers[0] = key
+        self.history[side][key] += depth * depth
+
+    def first_move_cutoff_rate(self):
+        """Fraction of cuts that happened on the first child searched."""
+        if self.cutoffs == 0:
+            return 0.0
+        return self.first_move_cutoffs / self.cutoffs
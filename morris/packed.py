@@ -0,0 +1,144 @@
+"""
+Files of small fixed-width integers, read through mmap.
+
+Precomputed tables (the endgame tablebases) are stored as one packed
+array each: a 24-byte header followed by `count`
+entries of `bits` bits (1, 2, 4, 8 or 16), entry i in the bits
+i * bits .. (i + 1) * bits - 1 counted from the least significant bit of
+the first data byte (16-bit entries little-endian).
+
+    offset  size
+    0       8     b"MORRISPK"
+    8       1     format version (1)
+    9       1     bits per entry
+    10      6     reserved (zero)
+    16      8     count, little-endian
+
+PackedTable maps the file read-only instead of reading it: opening costs
+the same whatever the size, a lookup reads its byte straight from the
+mapping without copying the table, and every process that opens the same
+file shares the pages the operating system caches for it.
+
+Files with records of their own (the opening book of morris/book.py) are
+written and mapped the same way through write_file() and map_file().
+"""
+
+import mmap
+import os
+import struct
+
+MAGIC = b"MORRISPK"
+VERSION = 1
+WIDTHS = (1, 2, 4, 8, 16)
+
+_HEADER = struct.Struct("<8sBB6xQ")
+HEADER_SIZE = _HEADER.size
+
+
+def width_for(largest):
+    """Fewest bits per entry (a valid width) that hold values up to `largest`."""
+    for bits in WIDTHS:
+        if largest < 1 << bits:
+            return bits
+    raise ValueError(f"{largest} does not fit in {WIDTHS[-1]} bits")
+
+
+def write_file(path, header, data):
+    """
+    Write the packed `header` followed by `data` to a file beside `path`
+    and rename it over `path` when complete, so readers never see a
+    partial file.
+    """
+    temporary = path + ".tmp"
+    with open(temporary, "wb") as f:
+        f.write(header)
+        f.write(data)
+    os.replace(temporary, path)
+
+
+def map_file(path, header, magic, version, kind, size):
+    """
+    (header fields, read-only mapping of the whole file) of the file at
+    `path`.  It must start with the struct `header`, whose first two fields
+    are `magic` and `version`, and be size(fields) bytes long (size may
+    raise ValueError itself); otherwise ValueError says it is not `kind`
+    or is truncated.
+    """
+    with open(path, "rb") as f:
+        data = f.read(header.size)
+        if len(data) != header.size:
+            raise ValueError(f"{path}: not {kind}")
+        fields = header.unpack(data)
+        if fields[0] != magic or fields[1] != version:
+            raise ValueError(f"{path}: not {kind}")
+        if os.fstat(f.fileno()).st_size != size(fields):
+            raise ValueError(f"{path}: truncated")
+        return fields, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def write_packed(path, values, bits):
+    """
+    Write `values` (a sequence of ints below 2 ** bits) as a packed table.
+    The file is written beside `path` and renamed over it when complete.
+    """
+    if bits not in WIDTHS:
+        raise ValueError(f"bits must be one of {WIDTHS}")
+    n = len(values)
+    if bits == 8:
+        data = bytes(values)
+    elif bits == 16:
+        data = struct.pack(f"<{n}H", *values)
+    else:
+        per_byte = 8 // bits
+        data = bytearray((n + per_byte - 1) // per_byte)
+        for i, value in enumerate(values):
+            if value:
+                data[i // per_byte] |= value << (i % per_byte * bits)
+
+    write_file(path, _HEADER.pack(MAGIC, VERSION, bits, n), data)
+
+
+class PackedTable:
+    """
+    Read-only view of a packed table file; table[i] is entry i.
+    Use as a context manager (or call close()) to unmap it.
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+        def size(fields):
+            _, _, bits, n = fields
+            if bits not in WIDTHS:
+                raise ValueError(f"{path}: not a packed table")
+            return HEADER_SIZE + (n * bits + 7) // 8
+
+        (_, _, bits, n), self.map = map_file(path, _HEADER, MAGIC, VERSION, "a packed table", size)
+        self.bits = bits
+        self.count = n
+        self._mask = (1 << bits) - 1
+        self._shift = {1: 3, 2: 2, 4: 1, 8: 0, 16: 0}[bits]
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, i):
+        if not 0 <= i < self.count:
+            raise IndexError("packed table index out of range")
+        bits = self.bits
+        if bits == 8:
+            return self.map[HEADER_SIZE + i]
+        if bits == 16:
+            offset = HEADER_SIZE + 2 * i
+            return self.map[offset] | self.map[offset + 1] << 8
+        byte = self.map[HEADER_SIZE + (i >> self._shift)]
+        return byte >> ((i & ((1 << self._shift) - 1)) * bits) & self._mask
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.map.close()
@@ -0,0 +1,186 @@
+"""
+Parallel alpha–beta by splitting the root across a process pool.
+
+The first root move (the most promising one after ordering) is searched
+with the full window in this process, which establishes a bound: for White
+(MAX) an alpha, for Black (MIN) a beta.  The remaining root moves are then
+handed to a ProcessPoolExecutor, each searched with the best bound known
+when it is submitted.  Moves are submitted only as workers become free, so
+every improvement found by one worker tightens the window of the moves
+handed out after it.
+
+A child searched with the window (alpha, +inf) either returns its exact
+value (> alpha) or fails low (<= alpha, so it cannot beat the move that set
+alpha).  Picking the first root move, in search order, with the best exact
+value therefore gives the same move and estimate as the serial search.
+
+Each worker process builds its own Engine, so transposition and ordering
+tables stay warm across the root moves (and searches) it is handed.
+"""
+
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from morris.board import WHITE
+from morris.position import Position
+from morris.search import Engine, MTDF, PVS
+
+# The Engine of a worker process, built by _init_worker.
+_worker_engine = None
+
+
+def _init_worker(config):
+    global _worker_engine
+    _worker_engine = Engine(**config)
+
+
+def _search_root_move(board, side, move, depth, alpha, beta, generation):
+    """
+    Worker task: play root move `move` for `side` on `board` and search the
+    child to depth - 1 with window (alpha, beta).  `generation` is that of
+    the root search, so the root moves a worker is handed share their
+    table entries as they would in the serial search.
+    Returns (value, nodes evaluated, statistics of the worker's tables).
+    """
+    engine = _worker_engine
+    tt = engine.transposition_table
+    orderer = engine.move_orderer
+    before = (tt.probes, tt.hits, orderer.cutoffs, orderer.first_move_cutoffs,
+              engine.quiescence_nodes, engine.tablebase_hits)
+
+    if tt.generation != generation:
+        engine.new_search()
+        tt.generation = generation
+    position = Position(board, side)
+    position.make_move(move)
+    if engine.variant == PVS:
+        if side == WHITE:                  # Black's point of view below
+            _, nodes, value = engine.PVS(position, depth - 1, -beta, -alpha, 1)
+            value = -value
+        else:
+            _, nodes, value = engine.PVS(position, depth - 1, alpha, beta, 1)
+    elif side == WHITE:
+        _, nodes, value = engine.ABminmax(position, depth - 1, alpha, beta, 1)
+    else:
+        _, nodes, value = engine.ABmaxmin(position, depth - 1, alpha, beta, 1)
+
+    after = (tt.probes, tt.hits, orderer.cutoffs, orderer.first_move_cutoffs,
+             engine.quiescence_nodes, engine.tablebase_hits)
+    return value, nodes, tuple(b - a for a, b in zip(before, after))
+
+
+class ParallelRootSearch:
+    """
+    Root-splitting alpha–beta over `workers` processes.
+
+    engine -- the Engine of this process; its configuration is copied into
+              every worker, it searches the first root move itself, and its
+              table statistics receive the workers' counts.  MTD(f) engines
+              are not supported: their passes each need the whole tree.
+
+    Use as a context manager (or call shutdown()) to stop the pool.
+    """
+
+    def __init__(self, engine, workers):
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        if engine.variant == MTDF:
+            raise ValueError("root splitting does not support MTD(f)")
+        self.engine = engine
+        self.workers = workers
+        self.executor = ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(engine.config(),))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+
+    def shutdown(self):
+        self.executor.shutdown(cancel_futures=True)
+
+    def root_moves(self, position):
+        """Root moves in the order the serial search would try them first."""
+        engine = self.engine
+        board = position.board()
+        entry = engine.probe_table(position)
+        hash_move = entry[4] if entry is not None else None
+        side = position.side
+        return list(engine.move_orderer.order(board, engine.iter_moves(board, side), side, 0, hash_move))
+
+    def search(self, position, depth):
+        """
+        The engine's alpha–beta variant from the root for the side to move.
+        Returns (best_move, nodes_evaluated, estimate) like Engine.search.
+        """
+        engine = self.engine
+        if depth < 2:
+            return engine.search(position, depth)
+
+        maximizing = position.side == WHITE
+        moves = self.root_moves(position)
+        if not moves:
+            return None, 0, float('-inf') if maximizing else float('inf')
+
+        board = position.board()
+        side = position.side
+
+        # Young brothers wait: the first move gets the full window here.
+        first = moves[0]
+        position.make_move(first)
+        if maximizing:
+            _, nodes, best_value = engine.ABminmax(position, depth - 1, float('-inf'), float('inf'), 1)
+        else:
+            _, nodes, best_value = engine.ABmaxmin(position, depth - 1, float('-inf'), float('inf'), 1)
+        position.unmake_move(first)
+
+        # exact[i] is the value of moves[i] if it beat the bound it was
+        # searched with, None if it failed against it.
+        exact = [None] * len(moves)
+        exact[0] = best_value
+
+        pending = {}
+        next_index = 1
+        while next_index < len(moves) or pending:
+            while next_index < len(moves) and len(pending) < self.workers:
+                if maximizing:
+                    window = (best_value, float('inf'))
+                else:
+                    window = (float('-inf'), best_value)
+                future = self.executor.submit(
+                    _search_root_move, board, side, moves[next_index], depth, *window,
+                    engine.transposition_table.generation)
+                pending[future] = (next_index, best_value)
+                next_index += 1
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                index, bound = pending.pop(future)
+                value, evaluated, stats = future.result()
+                nodes += evaluated
+                self._add_stats(stats)
+                if (value > bound) if maximizing else (value < bound):
+                    exact[index] = value
+                    if (value > best_value) if maximizing else (value < best_value):
+                        best_value = value
+
+        # First move in search order with the best value, as the serial
+        # search keeps the earliest of equally good moves.
+        best_index = 0
+        for index, value in enumerate(exact):
+            if value is not None and ((value > exact[best_index]) if maximizing
+                                      else (value < exact[best_index])):
+                best_index = index
+
+        return moves[best_index], nodes, exact[best_index]
+
+    def _add_stats(self, stats):
+        probes, hits, cutoffs, first_move_cutoffs, quiescence_nodes, tablebase_hits = stats
+        tt = self.engine.transposition_table
+        orderer = self.engine.move_orderer
+        tt.probes += probes
+        tt.hits += hits
+        orderer.cutoffs += cutoffs
+        orderer.first_move_cutoffs += first_move_cutoffs
+        self.engine.quiescence_nodes += quiescence_nodes
+        self.engine.tablebase_hits += tablebase_hits
@@ -0,0 +1,105 @@
+"""
+Mutable position for the searches.
+
+Instead of materializing every child board, a search node generates moves
+(origin, target, removed) and applies them one at a time with make_move(),
+undoing them again with unmake_move() after the child has been searched.
+The Zobrist key is updated incrementally along the way.
+
+A position built from a board that carries the pieces in hand
+(white, black, white_in_hand, black_in_hand) keeps them up to date too:
+every placement takes a piece from the mover's hand.
+"""
+
+from morris.board import BIT, NO_SQUARE, WHITE, BLACK, to_string
+from morris.ttable import (
+    ZOBRIST_WHITE, ZOBRIST_BLACK, ZOBRIST_BLACK_TO_MOVE, ZOBRIST_IN_HAND, zobrist_hash,
+)
+
+_ZOBRIST = (ZOBRIST_WHITE, ZOBRIST_BLACK)
+
+
+class Position:
+    """
+    bits  -- [white, black] bitboards (indexable like a (white, black) board),
+             followed by [white_in_hand, black_in_hand] when the board
+             carries the pieces in hand
+    side  -- WHITE or BLACK, the side to move
+    key   -- Zobrist key of bits and side
+    """
+
+    __slots__ = ('bits', 'side', 'key')
+
+    def __init__(self, board, side=WHITE):
+        self.bits = list(board)
+        self.side = side
+        self.key = zobrist_hash(board, side == BLACK)
+
+    def board(self):
+        """Return an immutable snapshot: (white, black), and the pieces in hand if any."""
+        return tuple(self.bits)
+
+    def __str__(self):
+        return to_string(self.bits)
+
+    def make_move(self, move):
+        """Play `move` for the side to move and pass the turn."""
+        origin, target, removed = move
+        side = self.side
+        bits = self.bits
+        keys = _ZOBRIST[side]
+
+        own = bits[side] | BIT[target]
+        key = self.key ^ keys[target] ^ ZOBRIST_BLACK_TO_MOVE
+        if origin != NO_SQUARE:
+            own ^= BIT[origin]
+            key ^= keys[origin]
+        elif len(bits) > 2:                    # placed from the hand
+            hand = bits[2 + side]
+            bits[2 + side] = hand - 1
+            key ^= ZOBRIST_IN_HAND[side][hand] ^ ZOBRIST_IN_HAND[side][hand - 1]
+        bits[side] = own
+
+        if removed != NO_SQUARE:
+            bits[1 - side] ^= BIT[removed]
+            key ^= _ZOBRIST[1 - side][removed]
+
+        self.side = 1 - side
+        self.key = key
+
+    def unmake_move(self, move):
+        """Take back `move`, which must be the last move made."""
+        origin, target, removed = move
+        side = 1 - self.side
+        bits = self.bits
+        keys = _ZOBRIST[side]
+
+        own = bits[side] ^ BIT[target]
+        key = self.key ^ keys[target] ^ ZOBRIST_BLACK_TO_MOVE
+        if origin != NO_SQUARE:
+            own |= BIT[origin]
+            key ^= keys[origin]
+        elif len(bits) > 2:                    # back into the hand
+            hand = bits[2 + side]
+            bits[2 + side] = hand + 1
+            key ^= ZOBRIST_IN_HAND[side][hand] ^ ZOBRIST_IN_HAND[side][hand + 1]
+        bits[side] = own
+
+        if removed != NO_SQUARE:
+            bits[1 - side] |= BIT[removed]
+            key ^= _ZOBRIST[1 - side][removed]
+
+        self.side = side
+        self.key = key
+
+
+def format_move(move):
+    """
+    Short text form of a move: '4' places on 4, '2-7' moves from 2 to 7,
+    and a trailing 'x12' removes the piece on 12.
+    """
+    origin, target, removed = move
+    text = str(target) if origin == NO_SQUARE else f"{origin}-{target}"
+    if removed != NO_SQUARE:
+        text += f"x{removed}"
+    return text
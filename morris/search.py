@@ -0,0 +1,654 @@
+"""
+The MINIMAX and alpha–beta searches shared by every script.
+
+An Engine bundles what one search configuration needs: the phase (which
+move generator to use), the static estimation, and for alpha–beta the
+transposition table, move orderer and search clock.  Keeping these on the
+engine instead of in module globals lets one process hold several
+differently configured engines, and keeps the tables warm from one search
+to the next.
+"""
+
+from morris.board import WHITE, BLACK, NO_SQUARE
+from morris.deepening import SearchClock, iterative_deepening
+from morris.evaluate import (
+    EstimationCache, static_estimation_opening, static_estimation_game, static_estimation_phased,
+    improved_static_estimation_opening, improved_static_estimation_game,
+    improved_static_estimation_phased,
+)
+from morris.movegen import (
+    generate_moves_opening, generate_moves_game, generate_moves_phased,
+    iter_moves_opening, iter_moves_game, iter_moves_phased,
+)
+from morris.ordering import MoveOrderer
+from morris.symmetry import INVERSES, canonical_key, transform_move
+from morris.ttable import DEFAULT_TT_ENTRIES, TranspositionTable, EXACT, LOWER, UPPER
+
+OPENING = 'opening'
+GAME = 'game'
+# Both, by the pieces in hand the position carries: placements while the
+# side to move has some left, midgame moves after, and the estimation of
+# the phase the leaf is in.  Positions must be built from boards with the
+# pieces in hand (see morris/board.py).
+PHASED = 'phased'
+
+# Alpha–beta variants (Engine.variant)
+ALPHABETA = 'alphabeta'          # full window at every child, as in the handout
+PVS = 'pvs'                      # principal variation search (NegaScout)
+MTDF = 'mtdf'                    # MTD(f): null-window alpha–beta passes
+VARIANTS = (ALPHABETA, PVS, MTDF)
+
+# Extra plies the quiescence search may add below a leaf.  Captures in the
+# midgame shrink the board so those lines end anyway, but in the opening a
+# placement that closes a mill keeps the number of empty points unchanged.
+QUIESCENCE_MAX_DEPTH = 8
+
+_GENERATORS = {
+    OPENING: (generate_moves_opening, iter_moves_opening),
+    GAME: (generate_moves_game, iter_moves_game),
+    PHASED: (generate_moves_phased, iter_moves_phased),
+}
+
+_ESTIMATIONS = {
+    (OPENING, False): static_estimation_opening,
+    (OPENING, True): improved_static_estimation_opening,
+    (GAME, False): static_estimation_game,
+    (GAME, True): improved_static_estimation_game,
+    (PHASED, False): static_estimation_phased,
+    (PHASED, True): improved_static_estimation_phased,
+}
+
+
+class Engine:
+    """
+    phase     -- OPENING, GAME or PHASED, selects move generation
+    improved  -- use the improved static estimation of that phase
+    ordering  -- sort alpha–beta children best-first; with False they are
+                 searched in generation order, as in the handout
+    tt_entries -- number of transposition table slots
+    replacement -- what a store does to a slot holding another position:
+                 'depth' keeps the deeper entry of the current search,
+                 'always' overwrites it (TranspositionTable)
+    quiescence -- extend alpha–beta leaves with a capture-only search
+    variant   -- ALPHABETA, PVS or MTDF, the tree search run by search() and
+                 deepen()
+    tablebase -- directory of endgame tables (morris/tablebase.py) to probe
+                 below the root; GAME phase only
+    symmetry  -- share transposition table entries between the mirror images
+                 of a position (morris/symmetry.py)
+    estimation_cache -- number of static estimations to remember across
+                 searches (morris/evaluate.py EstimationCache); 0 for none
+
+    quiescence_nodes counts the positions the quiescence search reached
+    beyond the nominal depth (they are also in the evaluated counts);
+    mtdf_passes counts the null-window searches MTD(f) made, and
+    tablebase_hits the nodes answered by the tablebase (they are not in the
+    evaluated counts: no static estimation was made).
+    """
+
+    def __init__(self, phase=GAME, improved=False, ordering=True, tt_entries=DEFAULT_TT_ENTRIES,
+                 replacement='depth', quiescence=False, variant=ALPHABETA, tablebase=None,
+                 symmetry=False, estimation_cache=0):
+        if phase not in _GENERATORS:
+            raise ValueError("phase must be 'opening', 'game' or 'phased'")
+        if variant not in VARIANTS:
+            raise ValueError(f"variant must be one of {', '.join(VARIANTS)}")
+        if tablebase is not None and phase != GAME:
+            raise ValueError("tablebases only cover the midgame/endgame")
+        self.phase = phase
+        self.improved = improved
+        self.ordering = ordering
+        self.tt_entries = tt_entries
+        self.replacement = replacement
+        self.quiescence = quiescence
+        self.quiescence_nodes = 0
+        self.variant = variant
+        self.mtdf_passes = 0
+        self.tablebase_directory = tablebase
+        self.tablebase = None
+        if tablebase is not None:
+            from morris.tablebase import Tablebase     # its indexing is only needed here
+            self.tablebase = Tablebase(tablebase)
+        self.tablebase_hits = 0
+        self.symmetry = symmetry
+        self.generate_moves, self.iter_moves = _GENERATORS[phase]
+        self.static_estimation = _ESTIMATIONS[phase, improved]
+        self.estimation_cache = estimation_cache
+        if estimation_cache:
+            self.static_estimation = EstimationCache(self.static_estimation, estimation_cache)
+
+        # Shared by every node of the search; positions reached through
+        # different move orders are looked up here before generating their
+        # children.
+        self.transposition_table = TranspositionTable(tt_entries, replacement)
+
+        # Sorts children best-first (hash move, captures, killers, history).
+        if ordering:
+            self.move_orderer = MoveOrderer()
+        else:
+            self.move_orderer = MoveOrderer(hash_move=False, captures=False, killers=False, history=False)
+
+        # Deadline for time-limited searches (see iterative_deepening).
+        self.search_clock = SearchClock()
+
+    def config(self):
+        """Keyword arguments that build an identically configured Engine."""
+        return dict(phase=self.phase, improved=self.improved,
+                    ordering=self.ordering, tt_entries=self.tt_entries,
+                    replacement=self.replacement,
+                    quiescence=self.quiescence, variant=self.variant,
+                    tablebase=self.tablebase_directory, symmetry=self.symmetry,
+                    estimation_cache=self.estimation_cache)
+
+    def new_search(self):
+        """
+        Prepare for the search of another position: the tables are kept
+        (warm) but aged, so stale entries give way to the new search first.
+
+        Entries of earlier searches only suggest hash moves.  Their values
+        were searched to other depths, and cutting off on them would make
+        a result depend on what the engine searched before; values cut off
+        only below the root and only from the current search.
+        """
+        self.transposition_table.new_search()
+        self.move_orderer.new_search()
+
+    def probe_table(self, position):
+        """
+        The transposition table entry of `position` (with symmetry on, of
+        its canonical form, the best move mapped back onto `position`), or
+        None.
+        """
+        if not self.symmetry:
+            return self.transposition_table.probe(position.key)
+        key, image = canonical_key(position.bits, position.side)
+        entry = self.transposition_table.probe(key)
+        if entry is None or not image:
+            return entry
+        return entry[:4] + (transform_move(entry[4], INVERSES[image]),) + entry[5:]
+
+    # ---------- MINIMAX ----------
+
+    def maxmin(self, position, depth):
+        # Base case: if we've reached a leaf node, evaluate statically
+        if depth == 0:
+            estimate = self.static_estimation(position.bits)
+            return None, 1, estimate  # One position evaluated
+
+        self.search_clock.tick()           # lets a deadline or a stop interrupt us
+
+        # Recursive case: generate possible moves for White (MAX player)
+        possible_moves = self.generate_moves(position.bits, WHITE)
+
+        best_move = None
+        best_estimate = float('-inf')
+        total_evaluated = 0
+
+        # For each move, call MIN node (Black's turn)
+        for move in possible_moves:
+            position.make_move(move)
+            _, child_evaluated, child_estimate = self.minmax(position, depth - 1)
+            position.unmake_move(move)
+
+            total_evaluated += child_evaluated
+
+            # White (MAX) wants to maximize the estimate
+            if child_estimate > best_estimate:
+                best_estimate = child_estimate
+                best_move = move
+
+        return best_move, total_evaluated, best_estimate
+
+    def minmax(self, position, depth):
+        # Base case: if we've reached a leaf node, evaluate statically
+        if depth == 0:
+            estimate = self.static_estimation(position.bits)
+            return None, 1, estimate  # One position evaluated
+
+        self.search_clock.tick()
+
+        # Recursive case: generate possible moves for Black (MIN player)
+        possible_moves = self.generate_moves(position.bits, BLACK)
+
+        best_move = None
+        best_estimate = float('inf')
+        total_evaluated = 0
+
+        # For each move, call MAX node (White's turn)
+        for move in possible_moves:
+            position.make_move(move)
+            _, child_evaluated, child_estimate = self.maxmin(position, depth - 1)
+            position.unmake_move(move)
+
+            total_evaluated += child_evaluated
+
+            # Black (MIN) wants to minimize the estimate
+            if child_estimate < best_estimate:
+                best_estimate = child_estimate
+                best_move = move
+
+        return best_move, total_evaluated, best_estimate
+
+    # ---------- Alpha–Beta ----------
+
+    def ABmaxmin(self, position, depth, alpha, beta, ply=0):
+        """
+        White to move (MAX). Alpha–beta per handout:
+          v = -inf
+          for each child:
+             v = max(v, MinMax(child, α, β))
+             if v >= β: return v     (β-cut)
+             else α = max(α, v)
+          return v
+        """
+        if ply and self.tablebase is not None:
+            exact = self.tablebase.score(position.bits, WHITE)
+            if exact is not None:
+                self.tablebase_hits += 1
+                return None, 0, exact
+
+        if depth == 0:
+            if self.quiescence:
+                return self.QSmaxmin(position, alpha, beta)
+            estimate = self.static_estimation(position.bits)
+            return None, 1, estimate
+
+        self.search_clock.tick()
+
+        transposition_table = self.transposition_table
+        if self.symmetry:
+            key, image = canonical_key(position.bits, WHITE)
+        else:
+            key, image = position.key, 0
+        entry = transposition_table.probe(key)
+        hash_move = None
+        if entry is not None:
+            _, entry_depth, flag, value, hash_move, generation = entry
+            if image:
+                hash_move = transform_move(hash_move, INVERSES[image])
+            if (ply and generation == transposition_table.generation
+                    and entry_depth >= depth
+                    and (flag == EXACT
+                         or (flag == LOWER and value >= beta)
+                         or (flag == UPPER and value <= alpha))):
+                return hash_move, 0, value
+
+        move_orderer = self.move_orderer
+        board = position.board()
+        possible_moves = move_orderer.order(board, self.iter_moves(board, WHITE), WHITE, ply, hash_move)
+        best_move = None
+        v = float('-inf')
+        total_evaluated = 0
+        alpha_orig = alpha                     # to classify v for the table
+
+        for index, move in enumerate(possible_moves):
+            position.make_move(move)
+            _, evaluated, child_v = self.ABminmax(position, depth - 1, alpha, beta, ply + 1)
+            position.unmake_move(move)
+            total_evaluated += evaluated
+
+            if child_v > v:
+                v = child_v
+                best_move = move
+
+            if v >= beta:                      # β cut (step 2.2.2 in handout)
+                move_orderer.record_cutoff(move, WHITE, ply, depth, index)
+                transposition_table.store(key, depth, LOWER, v,
+                                          transform_move(best_move, image) if image else best_move)
+                return best_move, total_evaluated, v
+            else:
+                alpha = max(alpha, v)          # tighten α (step 2.2.3)
+
+        # Every child failed low against the window: v is only a bound.
+        flag = UPPER if v <= alpha_orig else EXACT
+        transposition_table.store(key, depth, flag, v,
+                                  transform_move(best_move, image) if image else best_move)
+        return best_move, total_evaluated, v
+
+    def ABminmax(self, position, depth, alpha, beta, ply=0):
+        """
+        Black to move (MIN). Alpha–beta per handout:
+          v = +inf
+          for each child:
+             v = min(v, MaxMin(child, α, β))
+             if v <= α: return v     (α-cut)
+             else β = min(β, v)
+          return v
+        """
+        if ply and self.tablebase is not None:
+            exact = self.tablebase.score(position.bits, BLACK)
+            if exact is not None:
+                self.tablebase_hits += 1
+                return None, 0, exact
+
+        if depth == 0:
+            if self.quiescence:
+                return self.QSminmax(position, alpha, beta)
+            estimate = self.static_estimation(position.bits)
+            return None, 1, estimate
+
+        self.search_clock.tick()
+
+        transposition_table = self.transposition_table
+        if self.symmetry:
+            key, image = canonical_key(position.bits, BLACK)
+        else:
+            key, image = position.key, 0
+        entry = transposition_table.probe(key)
+        hash_move = None
+        if entry is not None:
+            _, entry_depth, flag, value, hash_move, generation = entry
+            if image:
+                hash_move = transform_move(hash_move, INVERSES[image])
+            if (ply and generation == transposition_table.generation
+                    and entry_depth >= depth
+                    and (flag == EXACT
+                         or (flag == LOWER and value >= beta)
+                         or (flag == UPPER and value <= alpha))):
+                return hash_move, 0, value
+
+        move_orderer = self.move_orderer
+        board = position.board()
+        possible_moves = move_orderer.order(board, self.iter_moves(board, BLACK), BLACK, ply, hash_move)
+        best_move = None
+        v = float('inf')
+        total_evaluated = 0
+        beta_orig = beta                       # to classify v for the table
+
+        for index, move in enumerate(possible_moves):
+            position.make_move(move)
+            _, evaluated, child_v = self.ABmaxmin(position, depth - 1, alpha, beta, ply + 1)
+            position.unmake_move(move)
+            total_evaluated += evaluated
+
+            if child_v < v:
+                v = child_v
+                best_move = move
+
+            if v <= alpha:                     # α cut (step 4.2.2 in handout)
+                move_orderer.record_cutoff(move, BLACK, ply, depth, index)
+                transposition_table.store(key, depth, UPPER, v,
+                                          transform_move(best_move, image) if image else best_move)
+                return best_move, total_evaluated, v
+            else:
+                beta = min(beta, v)            # tighten β (step 4.2.3)
+
+        # Every child failed high against the window: v is only a bound.
+        flag = LOWER if v >= beta_orig else EXACT
+        transposition_table.store(key, depth, flag, v,
+                                  transform_move(best_move, image) if image else best_move)
+        return best_move, total_evaluated, v
+
+    # ---------- Principal variation search ----------
+    #
+    # NegaScout in negamax form: one function for both sides, with values
+    # from the point of view of the side to move (White's estimate for
+    # White, its negation for Black).  With good ordering the first child
+    # is usually the best, so it gets the full window; every later child is
+    # only tested with a null window (α, α + 1) — does it beat α? — which
+    # fails quickly.  A child that does beat α is searched again with the
+    # full window to get its value.  The estimates are integers, so the
+    # null window is exactly one point wide.
+    #
+    # The transposition table keeps White's point of view (as ABmaxmin /
+    # ABminmax store it), so the table can be shared between variants.
+
+    def PVS(self, position, depth, alpha, beta, ply=0):
+        """
+        Side to move: position.side. Returns (best_move, evaluated, v)
+        with v from the point of view of the side to move.
+        """
+        side = position.side
+        sign = 1 if side == WHITE else -1
+
+        if ply and self.tablebase is not None:
+            exact = self.tablebase.score(position.bits, side)
+            if exact is not None:
+                self.tablebase_hits += 1
+                return None, 0, sign * exact
+
+        if depth == 0:
+            if not self.quiescence:
+                return None, 1, sign * self.static_estimation(position.bits)
+            if side == WHITE:
+                return self.QSmaxmin(position, alpha, beta)
+            best_move, evaluated, v = self.QSminmax(position, -beta, -alpha)
+            return best_move, evaluated, -v
+
+        self.search_clock.tick()
+
+        transposition_table = self.transposition_table
+        if self.symmetry:
+            key, image = canonical_key(position.bits, side)
+        else:
+            key, image = position.key, 0
+        entry = transposition_table.probe(key)
+        hash_move = None
+        if entry is not None:
+            _, entry_depth, flag, value, hash_move, generation = entry
+            if image:
+                hash_move = transform_move(hash_move, INVERSES[image])
+            if ply and entry_depth >= depth and generation == transposition_table.generation:
+                value *= sign
+                if side == BLACK and flag != EXACT:
+                    flag = LOWER if flag == UPPER else UPPER
+                if (flag == EXACT
+                        or (flag == LOWER and value >= beta)
+                        or (flag == UPPER and value <= alpha)):
+                    return hash_move, 0, value
+
+        move_orderer = self.move_orderer
+        board = position.board()
+        possible_moves = move_orderer.order(board, self.iter_moves(board, side), side, ply, hash_move)
+        best_move = None
+        v = float('-inf')
+        total_evaluated = 0
+        alpha_orig = alpha
+
+        for index, move in enumerate(possible_moves):
+            position.make_move(move)
+            if index == 0 or alpha == float('-inf'):
+                _, evaluated, child_v = self.PVS(position, depth - 1, -beta, -alpha, ply + 1)
+                child_v = -child_v
+            else:
+                _, evaluated, child_v = self.PVS(position, depth - 1, -alpha - 1, -alpha, ply + 1)
+                child_v = -child_v
+                if alpha < child_v < beta:     # fail high: get the real value
+                    _, more, child_v = self.PVS(position, depth - 1, -beta, -child_v, ply + 1)
+                    child_v = -child_v
+                    evaluated += more
+            position.unmake_move(move)
+            total_evaluated += evaluated
+
+            if child_v > v:
+                v = child_v
+                best_move = move
+
+            if v >= beta:
+                move_orderer.record_cutoff(move, side, ply, depth, index)
+                break
+            alpha = max(alpha, v)
+
+        if v >= beta:
+            flag = LOWER
+        elif v <= alpha_orig:
+            flag = UPPER
+        else:
+            flag = EXACT
+        if side == BLACK and flag != EXACT:
+            flag = LOWER if flag == UPPER else UPPER
+        transposition_table.store(key, depth, flag, sign * v,
+                                  transform_move(best_move, image) if image else best_move)
+        return best_move, total_evaluated, v
+
+    # ---------- Quiescence ----------
+    #
+    # A leaf whose side to move can close a mill is not quiet: the static
+    # estimation would miss the piece about to be removed (the horizon
+    # effect).  With quiescence on, the leaves of the alpha–beta search
+    # keep searching capturing moves only, until a quiet position (or
+    # QUIESCENCE_MAX_DEPTH extra plies) is reached.  The side to move may
+    # always "stand pat" on the static estimation instead of capturing.
+
+    def QSmaxmin(self, position, alpha, beta, qdepth=0):
+        """White to move (MAX), captures only. Returns (best_move, evaluated, v)."""
+        stand_pat = self.static_estimation(position.bits)
+        if stand_pat >= beta or qdepth >= QUIESCENCE_MAX_DEPTH:
+            return None, 1, stand_pat
+
+        self.search_clock.tick()
+
+        best_move = None
+        v = stand_pat
+        alpha = max(alpha, v)
+        total_evaluated = 1
+
+        for move in self.iter_moves(position.board(), WHITE):
+            if move[2] == NO_SQUARE:
+                continue
+            position.make_move(move)
+            self.quiescence_nodes += 1
+            _, evaluated, child_v = self.QSminmax(position, alpha, beta, qdepth + 1)
+            position.unmake_move(move)
+            total_evaluated += evaluated
+
+            if child_v > v:
+                v = child_v
+                best_move = move
+            if v >= beta:
+                return best_move, total_evaluated, v
+            alpha = max(alpha, v)
+
+        return best_move, total_evaluated, v
+
+    def QSminmax(self, position, alpha, beta, qdepth=0):
+        """Black to move (MIN), captures only. Returns (best_move, evaluated, v)."""
+        stand_pat = self.static_estimation(position.bits)
+        if stand_pat <= alpha or qdepth >= QUIESCENCE_MAX_DEPTH:
+            return None, 1, stand_pat
+
+        self.search_clock.tick()
+
+        best_move = None
+        v = stand_pat
+        beta = min(beta, v)
+        total_evaluated = 1
+
+        for move in self.iter_moves(position.board(), BLACK):
+            if move[2] == NO_SQUARE:
+                continue
+            position.make_move(move)
+            self.quiescence_nodes += 1
+            _, evaluated, child_v = self.QSmaxmin(position, alpha, beta, qdepth + 1)
+            position.unmake_move(move)
+            total_evaluated += evaluated
+
+            if child_v < v:
+                v = child_v
+                best_move = move
+            if v <= alpha:
+                return best_move, total_evaluated, v
+            beta = min(beta, v)
+
+        return best_move, total_evaluated, v
+
+    # ---------- Root drivers ----------
+
+    def minimax(self, position, depth):
+        """Plain MINIMAX from the root for the side to move."""
+        if position.side == WHITE:
+            return self.maxmin(position, depth)
+        return self.minmax(position, depth)
+
+    def alphabeta(self, position, depth, alpha=float('-inf'), beta=float('inf')):
+        """Alpha–beta from the root for the side to move."""
+        if position.side == WHITE:
+            return self.ABmaxmin(position, depth, alpha, beta)
+        return self.ABminmax(position, depth, alpha, beta)
+
+    def pvs(self, position, depth, alpha=float('-inf'), beta=float('inf')):
+        """
+        Principal variation search from the root for the side to move.
+        The window and the estimate are White's, as in alphabeta().
+        """
+        if position.side == WHITE:
+            return self.PVS(position, depth, alpha, beta)
+        best_move, evaluated, v = self.PVS(position, depth, -beta, -alpha)
+        return best_move, evaluated, -v
+
+    def mtdf(self, position, depth, guess):
+        """
+        MTD(f) from the root for the side to move, starting from `guess`.
+
+        Each pass is an alpha–beta search with a null window (β - 1, β),
+        which only answers whether the value is below β or not; the
+        transposition table keeps what earlier passes learned, so every
+        pass after the first is cheap.  The bounds close in on the value
+        from both sides until they meet.
+        Returns (best_move, nodes_evaluated, estimate) like alphabeta().
+        """
+        maximizing = position.side == WHITE
+        lower, upper = float('-inf'), float('inf')
+        g = guess
+        best_move = None
+        total_evaluated = 0
+
+        while lower < upper:
+            beta = g + 1 if g == lower else g
+            if beta == float('-inf'):
+                # No null window lies above a lost guess: -inf + 1 is still
+                # -inf, and the pass would answer the same forever.  One
+                # open-window search settles the value instead.
+                move, evaluated, g = self.alphabeta(position, depth)
+                self.mtdf_passes += 1
+                return move, total_evaluated + evaluated, g
+            move, evaluated, g = self.alphabeta(position, depth, beta - 1, beta)
+            self.mtdf_passes += 1
+            total_evaluated += evaluated
+            if g < beta:
+                upper = g
+                if not maximizing:             # Black found a move reaching g
+                    best_move = move
+            else:
+                lower = g
+                if maximizing:                 # White found a move reaching g
+                    best_move = move
+            if best_move is None:
+                best_move = move
+
+        return best_move, total_evaluated, g
+
+    def mtdf_search(self, position, depth):
+        """
+        MTD(f) seeded with the value of the previous iteration: the root's
+        transposition table entry when iterative deepening (or an earlier
+        search) left one, otherwise a search one ply shallower.
+        """
+        entry = self.probe_table(position)
+        if entry is not None:
+            return self.mtdf(position, depth, entry[3])
+        if depth <= 1:
+            return self.mtdf(position, depth, self.static_estimation(position.bits))
+        _, shallow_evaluated, guess = self.mtdf_search(position, depth - 1)
+        best_move, evaluated, estimate = self.mtdf(position, depth, guess)
+        return best_move, shallow_evaluated + evaluated, estimate
+
+    def search(self, position, depth, alpha=float('-inf'), beta=float('inf')):
+        """
+        The alpha–beta variant this engine was built with, from the root.
+        MTD(f) picks its own windows and always finds the exact value.
+        """
+        if self.variant == PVS:
+            return self.pvs(position, depth, alpha, beta)
+        if self.variant == MTDF:
+            return self.mtdf_search(position, depth)
+        return self.alphabeta(position, depth, alpha, beta)
+
+    def deepen(self, position, budget_ms, max_depth=None, on_iteration=None):
+        """
+        search() by iterative deepening within budget_ms milliseconds.
+        Returns (best_move, nodes_evaluated, estimate, depth); on_iteration
+        is passed on to iterative_deepening.
+        """
+        return iterative_deepening(self.search, position, self.search_clock,
+                                   budget_ms, max_depth=max_depth, on_iteration=on_iteration)
@@ -0,0 +1,226 @@
+"""
+Analysis daemon: a long-running process that searches positions sent over
+a local socket, with the engines' tables kept warm between requests.
+
+    python3 -m morris.server --socket /tmp/morris.sock
+    python3 -m morris.server --port 5151          (TCP on 127.0.0.1)
+
+The protocol is line-delimited JSON.  Each request is one object on one
+line; a connection may send any number of them and gets one response line
+per request, in order:
+
+    {"board": "xWxBxx...", "phase": "game", "side": "white",
+     "depth": 5, "time_ms": 1000, "algorithm": "alphabeta",
+     "improved": false, "ordering": true, "quiescence": false,
+     "variant": "alphabeta", "symmetry": false}
+
+Only "board" and one of "depth" (at most 64) / "time_ms" are required; the
+rest default to the values shown ("algorithm" may also be "minimax", which needs a
+depth; "variant" may be "pvs" for principal variation search or "mtdf";
+"symmetry" shares table entries between mirror-image positions).  The
+response carries the fields the scripts print:
+
+    {"board_position": ..., "best_move": ..., "positions_evaluated": ...,
+     "depth_completed": ..., "tt_hits": ..., "tt_probes": ...,
+     "tt_hit_rate": ..., "cutoffs": ..., "first_move_cutoffs": ...,
+     "first_move_cutoff_rate": ..., "estimate": ..., "seconds": ...}
+
+plus "quiescence_nodes" when the request asked for quiescence and
+"mtdf_passes" for MTD(f).
+
+or {"error": "..."} for a request that cannot be served.  The table
+statistics cover that request only.
+
+One Engine is kept per configuration (phase, estimation, ordering,
+quiescence, variant, symmetry) for the life of the daemon, with its
+transposition table and a cache of static estimations (EstimationCache in
+morris/evaluate.py) warm.  Table entries of earlier requests only order
+the moves, so the estimate of a request does not depend on what was asked
+before.  Connections are handled in threads, but searches run one at a
+time since they are CPU-bound and the engines are not thread-safe.
+"""
+
+import argparse
+import json
+import os
+import socketserver
+import threading
+
+from morris.batch import analyze, parse_board
+from morris.board import WHITE, BLACK
+from morris.evaluate import DEFAULT_CACHE_ENTRIES
+from morris.search import Engine, OPENING, GAME, ALPHABETA, MTDF, VARIANTS
+
+SIDES = {"white": WHITE, "black": BLACK}
+ALGORITHMS = ("alphabeta", "minimax")
+
+# Deepest search a request may ask for; far deeper ones would exhaust the
+# recursion limit long before they finished.
+MAX_DEPTH = 64
+
+
+class AnalysisService:
+    """Engines by configuration, and the lock that serializes searches."""
+
+    def __init__(self, tt_entries=None):
+        self.tt_entries = tt_entries
+        self.engines = {}
+        self.lock = threading.Lock()
+
+    def engine(self, phase, improved, ordering, quiescence=False, variant=ALPHABETA, symmetry=False):
+        key = (phase, improved, ordering, quiescence, variant, symmetry)
+        engine = self.engines.get(key)
+        if engine is None:
+            if self.tt_entries is None:
+                engine = Engine(phase, improved=improved, ordering=ordering,
+                                quiescence=quiescence, variant=variant, symmetry=symmetry,
+                                estimation_cache=DEFAULT_CACHE_ENTRIES)
+            else:
+                engine = Engine(phase, improved=improved, ordering=ordering,
+                                tt_entries=self.tt_entries, quiescence=quiescence,
+                                variant=variant, symmetry=symmetry,
+                                estimation_cache=DEFAULT_CACHE_ENTRIES)
+            self.engines[key] = engine
+        return engine
+
+    def handle(self, request, on_iteration=None):
+        """
+        Serve one decoded request; return the response object.
+        on_iteration is passed on to analyze().
+        """
+        if not isinstance(request, dict):
+            raise ValueError("request must be a JSON object")
+        board = parse_board(str(request.get("board", "")))
+
+        phase = request.get("phase", GAME)
+        if phase not in (OPENING, GAME):
+            raise ValueError("phase must be 'opening' or 'game'")
+        side = SIDES.get(request.get("side", "white"))
+        if side is None:
+            raise ValueError("side must be 'white' or 'black'")
+        algorithm = request.get("algorithm", "alphabeta")
+        if algorithm not in ALGORITHMS:
+            raise ValueError("algorithm must be 'alphabeta' or 'minimax'")
+
+        depth = request.get("depth")
+        time_ms = request.get("time_ms")
+        if depth is None and time_ms is None:
+            raise ValueError("a depth or a time_ms budget is required")
+        for name, value in (("depth", depth), ("time_ms", time_ms)):
+            if value is not None and (not isinstance(value, int) or isinstance(value, bool)
+                                      or value < 1):
+                raise ValueError(f"{name} must be a positive integer")
+        if depth is not None and depth > MAX_DEPTH:
+            raise ValueError(f"depth must be at most {MAX_DEPTH}")
+        if algorithm == "minimax" and (depth is None or time_ms is not None):
+            raise ValueError("minimax needs a depth and no time_ms")
+
+        variant = request.get("variant", ALPHABETA)
+        if variant not in VARIANTS:
+            raise ValueError(f"variant must be one of {', '.join(VARIANTS)}")
+
+        quiescence = bool(request.get("quiescence", False))
+        with self.lock:
+            engine = self.engine(phase, bool(request.get("improved", False)),
+                                 bool(request.get("ordering", True)), quiescence, variant,
+                                 bool(request.get("symmetry", False)))
+            engine.new_search()
+            tt = engine.transposition_table
+            orderer = engine.move_orderer
+            before = (tt.hits, tt.probes, orderer.cutoffs, orderer.first_move_cutoffs,
+                      engine.quiescence_nodes, engine.mtdf_passes)
+            result = analyze(engine, board, side, algorithm, depth, time_ms, on_iteration)
+            hits, probes, cutoffs, first_move_cutoffs, quiescence_nodes, mtdf_passes = (
+                b - a for a, b in zip(before, (tt.hits, tt.probes, orderer.cutoffs,
+                                               orderer.first_move_cutoffs,
+                                               engine.quiescence_nodes, engine.mtdf_passes)))
+
+        response = {
+            "board_position": result["best_board"],
+            "best_move": result["best_move"],
+            "positions_evaluated": result["nodes"],
+        }
+        if time_ms is not None:
+            response["depth_completed"] = result["depth"]
+        if algorithm == "alphabeta":
+            response.update(
+                tt_hits=hits, tt_probes=probes,
+                tt_hit_rate=hits / probes if probes else 0.0,
+                cutoffs=cutoffs, first_move_cutoffs=first_move_cutoffs,
+                first_move_cutoff_rate=first_move_cutoffs / cutoffs if cutoffs else 0.0)
+        if quiescence:
+            response["quiescence_nodes"] = quiescence_nodes
+        if variant == MTDF and algorithm == "alphabeta":
+            response["mtdf_passes"] = mtdf_passes
+        response["estimate"] = result["estimate"]
+        response["seconds"] = result["seconds"]
+        return response
+
+
+class RequestHandler(socketserver.StreamRequestHandler):
+
+    def handle(self):
+        service = self.server.service
+        for line in self.rfile:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                response = service.handle(json.loads(line))
+            except (ValueError, TypeError) as e:      # includes JSONDecodeError
+                response = {"error": str(e)}
+            except Exception as e:
+                # A failed search still gets its answer, and the connection lives on.
+                response = {"error": f"search failed: {e or type(e).__name__}"}
+            self.wfile.write((json.dumps(response) + "\n").encode())
+            self.wfile.flush()
+
+
+class TCPServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def make_server(service, socket_path=None, host="127.0.0.1", port=None):
+    """Bind a server for `service` on a Unix socket path or a TCP port."""
+    if socket_path is not None:
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)            # left over from an earlier run
+        server = UnixServer(socket_path, RequestHandler)
+    else:
+        server = TCPServer((host, port), RequestHandler)
+    server.service = service
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve searches over a local socket.")
+    where = parser.add_mutually_exclusive_group(required=True)
+    where.add_argument("--socket", help="listen on this Unix domain socket path")
+    where.add_argument("--port", type=int, help="listen on this TCP port")
+    parser.add_argument("--host", default="127.0.0.1",
+                        help="TCP address to bind (default 127.0.0.1)")
+    parser.add_argument("--tt-entries", type=int,
+                        help="transposition table slots per engine")
+    args = parser.parse_args()
+
+    service = AnalysisService(args.tt_entries)
+    server = make_server(service, args.socket, args.host, args.port)
+    where = args.socket or f"{args.host}:{server.server_address[1]}"
+    print(f"listening on {where}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if args.socket and os.path.exists(args.socket):
+            os.unlink(args.socket)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,299 @@
+"""
+Lazy SMP: several processes search the same position at once and share
+nothing but a transposition table in shared memory.
+
+This process runs the usual iterative deepening and its result is the
+answer.  Each helper process runs its own iterative deepening on the same
+position, helper i starting at depth 1 + i % 2, so that half of them are
+always a ply ahead of the main search.  Helpers never report moves; what
+they contribute is the entries they store (exact values, cut bounds and
+hash moves) which the main search then finds in the shared table instead
+of searching those subtrees itself.  Unlike root splitting (morris/parallel.py)
+this also keeps every process busy on positions with few root moves, such
+as the hopping endgame.
+
+The helpers stop when the main search finishes.  Since the helpers race
+the main search, node counts (and, through deeper table entries, sometimes
+the estimate) vary from run to run.
+"""
+
+import multiprocessing
+import struct
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from morris.board import NUM_SQUARES
+from morris.deepening import SearchClock, SearchTimeout, iterative_deepening
+from morris.position import Position
+from morris.search import Engine
+from morris.ttable import DEFAULT_TT_ENTRIES, REPLACEMENTS, TranspositionTable
+
+# ---------- Shared-memory table ----------
+
+# An entry of the shared table is two unsigned 64-bit words, (key ^ data,
+# data), with everything but the key packed into `data`:
+#
+#   bits  0-31  value + 2**31 (the infinities of a node without moves are
+#               stored as +-(2**31 - 1))
+#   bits 32-38  depth (0..127)
+#   bits 39-40  flag
+#   bits 41-46  generation modulo 64
+#   bits 47-62  best move, 0 for none
+#
+# Processes read and write entries without locking.  A write racing with a
+# read (or another write) can leave the two words from different entries;
+# the XOR check then fails and the slot simply reads as a miss.
+_SHARED_ENTRY = struct.Struct('<QQ')
+_VALUE_INF = (1 << 31) - 1
+_MAX_DEPTH = (1 << 7) - 1
+_GENERATIONS = 1 << 6
+
+
+def _pack_move(move):
+    if move is None:
+        return 0
+    origin, target, removed = move
+    return 1 + ((origin + 1) * NUM_SQUARES + target) * (NUM_SQUARES + 1) + removed + 1
+
+
+def _unpack_move(code):
+    if code == 0:
+        return None
+    code -= 1
+    code, removed = divmod(code, NUM_SQUARES + 1)
+    origin, target = divmod(code, NUM_SQUARES)
+    return origin - 1, target, removed - 1
+
+
+class SharedTranspositionTable(TranspositionTable):
+    """
+    Transposition table in a multiprocessing.shared_memory block, so every
+    process of a parallel search reads and writes the same entries.
+
+    The creating process passes max_entries (and owns the block: it must
+    call unlink() when done); other processes attach with
+    SharedTranspositionTable.attach(name, max_entries).  Statistics
+    (probes, hits, stores) and the generation are per process.
+    """
+
+    def __init__(self, max_entries=DEFAULT_TT_ENTRIES, replacement='depth', name=None):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        if replacement not in REPLACEMENTS:
+            raise ValueError("replacement must be 'depth' or 'always'")
+
+        size = 1 << (max_entries.bit_length() - 1)
+        self.size = size
+        self.mask = size - 1
+        self.replacement = replacement
+        self.generation = 0
+        self.owner = name is None
+        if self.owner:
+            self.shm = shared_memory.SharedMemory(create=True, size=size * _SHARED_ENTRY.size)
+            self.shm.buf[:] = bytes(len(self.shm.buf))
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+        self.name = self.shm.name
+        self.buf = self.shm.buf
+
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+
+    @classmethod
+    def attach(cls, name, max_entries, replacement='depth'):
+        """Open the table created by another process under `name`."""
+        return cls(max_entries, replacement, name=name)
+
+    def new_search(self):
+        self.generation = (self.generation + 1) % _GENERATIONS
+
+    def clear(self):
+        self.buf[:] = bytes(len(self.buf))
+        self.generation = 0
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+
+    def close(self):
+        """Detach this process from the block."""
+        self.buf = None
+        self.shm.close()
+
+    def unlink(self):
+        """Detach and free the block (creating process only)."""
+        self.close()
+        if self.owner:
+            self.shm.unlink()
+
+    def _read(self, key):
+        """Return the decoded entry in key's slot if it is for key, else None."""
+        check, data = _SHARED_ENTRY.unpack_from(self.buf, (key & self.mask) * _SHARED_ENTRY.size)
+        if data == 0 or check ^ data != key:
+            return None
+        value = (data & 0xFFFFFFFF) - (1 << 31)
+        if value == _VALUE_INF:
+            value = float('inf')
+        elif value == -_VALUE_INF:
+            value = float('-inf')
+        return (key, data >> 32 & _MAX_DEPTH, data >> 39 & 3, value,
+                _unpack_move(data >> 47 & 0xFFFF), data >> 41 & (_GENERATIONS - 1))
+
+    def probe(self, key):
+        self.probes += 1
+        entry = self._read(key)
+        if entry is not None:
+            self.hits += 1
+        return entry
+
+    def store(self, key, depth, flag, value, best_move):
+        offset = (key & self.mask) * _SHARED_ENTRY.size
+        if self.replacement == 'depth':
+            check, data = _SHARED_ENTRY.unpack_from(self.buf, offset)
+            if (data != 0 and check ^ data != key
+                    and data >> 41 & (_GENERATIONS - 1) == self.generation
+                    and data >> 32 & _MAX_DEPTH > depth):
+                return
+
+        if value == float('inf'):
+            value = _VALUE_INF
+        elif value == float('-inf'):
+            value = -_VALUE_INF
+        data = ((value + (1 << 31)) & 0xFFFFFFFF
+                | min(depth, _MAX_DEPTH) << 32
+                | flag << 39
+                | self.generation << 41
+                | _pack_move(best_move) << 47)
+        _SHARED_ENTRY.pack_into(self.buf, offset, key ^ data, data)
+        self.stores += 1
+
+
+# ---------- Helpers ----------
+
+# The Engine of a helper process, built by _init_helper.
+_helper_engine = None
+
+
+class StopClock(SearchClock):
+    """
+    Search clock of a helper: besides the deadline, tick() also gives up
+    once the shared stop event is set.
+    """
+
+    def __init__(self, stop_event):
+        super().__init__()
+        self.stop_event = stop_event
+
+    def tick(self):
+        self.countdown -= 1
+        if self.countdown <= 0:
+            self.countdown = self.CHECK_EVERY
+            if self.stop_event.is_set():
+                raise SearchTimeout
+            if self.deadline is not None and time.perf_counter() >= self.deadline:
+                raise SearchTimeout
+
+
+def _init_helper(config, table_name, stop_event):
+    global _helper_engine
+    engine = Engine(**config)
+    engine.transposition_table = SharedTranspositionTable.attach(
+        table_name, config['tt_entries'], config['replacement'])
+    engine.search_clock = StopClock(stop_event)
+    _helper_engine = engine
+
+
+def _helper_search(board, side, start_depth, max_depth, generation):
+    """
+    Helper task: iterative deepening from start_depth until max_depth is
+    done (None: no limit) or the stop event is set.
+    Returns (nodes evaluated, deepest completed depth).
+    """
+    engine = _helper_engine
+    engine.move_orderer.new_search()
+    engine.transposition_table.generation = generation
+
+    position = Position(board, side)
+    nodes = 0
+    completed = 0
+    depth = start_depth
+    try:
+        while max_depth is None or depth <= max_depth:
+            _, evaluated, _ = engine.search(position, depth)
+            nodes += evaluated
+            completed = depth
+            depth += 1
+    except SearchTimeout:
+        pass
+    return nodes, completed
+
+
+class LazySMPSearch:
+    """
+    Lazy SMP over this process and `helpers` helper processes.
+
+    engine -- the Engine of this process; its transposition table is
+              replaced by a shared one of the same size, and its
+              configuration is copied into every helper.
+
+    Use as a context manager (or call shutdown()) to stop the helpers and
+    free the shared table.
+    """
+
+    def __init__(self, engine, helpers):
+        if helpers < 0:
+            raise ValueError("helpers must not be negative")
+        self.engine = engine
+        self.helpers = helpers
+        self.table = SharedTranspositionTable(engine.tt_entries, engine.replacement)
+        engine.transposition_table = self.table
+        self.stop_event = multiprocessing.Event()
+        self.executor = None
+        if helpers:
+            self.executor = ProcessPoolExecutor(
+                max_workers=helpers, initializer=_init_helper,
+                initargs=(engine.config(), self.table.name, self.stop_event))
+        self.helper_nodes = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+
+    def shutdown(self):
+        self.stop_event.set()
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+        self.table.unlink()
+
+    def search(self, position, depth=None, budget_ms=None):
+        """
+        Iterative deepening to `depth` and/or within budget_ms milliseconds,
+        with the helpers running alongside.
+        Returns (best_move, nodes_evaluated, estimate, depth) of the main
+        search; helper_nodes holds what the helpers evaluated.
+        """
+        if depth is None and budget_ms is None:
+            raise ValueError("a depth or a time budget is required")
+
+        engine = self.engine
+        engine.new_search()
+        self.stop_event.clear()
+
+        board = position.board()
+        futures = [
+            self.executor.submit(_helper_search, board, position.side, 1 + i % 2,
+                                 None if depth is None else depth + 1, self.table.generation)
+            for i in range(self.helpers)
+        ]
+        try:
+            result = iterative_deepening(
+                engine.search, position, engine.search_clock,
+                float('inf') if budget_ms is None else budget_ms, max_depth=depth)
+        finally:
+            self.stop_event.set()
+            self.helper_nodes = sum(future.result()[0] for future in futures)
+        return result
@@ -0,0 +1,154 @@
+"""
+Symmetries of the Morris Variant board, for caches and tables that should
+treat mirror-image positions as one.
+
+An automorphism is a permutation of the 21 points that maps the adjacency
+of neighbors() onto itself and the mills of close_mill() onto mills, so it
+maps every position onto one with the same moves, mills and estimates.
+The group is computed from NEIGHBORS and MILLS below rather than written
+out; for this board it has four elements: the identity, the reflection
+that swaps the diagonal mills (12, 15, 18) and (14, 17, 20), the
+reflection that maps each of them onto itself (12 <-> 18, 14 <-> 20), and
+the two together.
+
+The canonical form of a position is the image with the smallest
+(white, black) bitboards.  Bitboards are permuted through the 7-bit chunk
+tables zobrist_hash() hashes them with (morris/ttable.py chunk_tables), so
+canonicalizing is a few dozen table lookups.
+"""
+
+from morris.board import BIT, NEIGHBORS, NUM_SQUARES, WHITE, BLACK
+from morris.mills import MILLS
+from morris.ttable import CHUNK_MASK, chunk_tables, zobrist_hash
+
+
+def automorphisms():
+    """
+    Every permutation p of the points (p[i] is the image of point i) that
+    preserves adjacency and maps mills to mills; the identity comes first.
+    """
+    adjacent = [set(n) for n in NEIGHBORS]
+    mills = {frozenset(mill) for mill in MILLS}
+    found = []
+
+    # Points in breadth-first order from point 0, each after a neighbor
+    # (its parent) whose image is already chosen: a point's image must then
+    # be one of the few neighbors of its parent's image.
+    order = [0]
+    parent = {0: None}
+    for point in order:
+        for n in NEIGHBORS[point]:
+            if n not in parent:
+                parent[n] = point
+                order.append(n)
+
+    images = [None] * NUM_SQUARES
+
+    def extend(k):
+        if k == NUM_SQUARES:
+            if {frozenset(images[i] for i in mill) for mill in mills} == mills:
+                found.append(tuple(images))
+            return
+        point = order[k]
+        mapped = order[:k]
+        used = {images[j] for j in mapped}
+        candidates = range(NUM_SQUARES) if k == 0 else adjacent[images[parent[point]]]
+        for image in candidates:
+            # Adjacency to every point mapped so far must be kept both ways.
+            if (image not in used
+                    and len(adjacent[image]) == len(adjacent[point])
+                    and all((images[j] in adjacent[image]) == (j in adjacent[point])
+                            for j in mapped)):
+                images[point] = image
+                extend(k + 1)
+        images[point] = None
+
+    extend(0)
+    return tuple(sorted(found))
+
+
+AUTOMORPHISMS = automorphisms()
+
+# INVERSES[g] is the index of the automorphism undoing AUTOMORPHISMS[g].
+INVERSES = tuple(
+    next(h for h, q in enumerate(AUTOMORPHISMS) if all(q[p[i]] == i for i in range(NUM_SQUARES)))
+    for p in AUTOMORPHISMS
+)
+
+# Point maps for moves: a trailing -1 makes p[NO_SQUARE] == NO_SQUARE.
+_POINT_MAPS = tuple(p + (-1,) for p in AUTOMORPHISMS)
+
+# The images of distinct points are distinct bits, so XOR-ing them is OR-ing.
+_TABLES = tuple(chunk_tables([BIT[p[i]] for i in range(NUM_SQUARES)]) for p in AUTOMORPHISMS)
+
+# The identity needs no tables.
+_NON_IDENTITY = tuple(range(1, len(AUTOMORPHISMS)))
+
+
+def transform(bits, g):
+    """Image of the bitboard `bits` under AUTOMORPHISMS[g]."""
+    t0, t1, t2 = _TABLES[g]
+    return t0[bits & CHUNK_MASK] | t1[bits >> 7 & CHUNK_MASK] | t2[bits >> 14]
+
+
+def transform_board(board, g):
+    """Image of a (white, black) board under AUTOMORPHISMS[g]."""
+    return transform(board[WHITE], g), transform(board[BLACK], g)
+
+
+def transform_move(move, g):
+    """Image of an (origin, target, removed) move under AUTOMORPHISMS[g]."""
+    if move is None:
+        return None
+    p = _POINT_MAPS[g]
+    origin, target, removed = move
+    return p[origin], p[target], p[removed]
+
+
+def canonical(board):
+    """
+    (canonical board, g): the smallest image of `board` and the index of
+    an automorphism that maps `board` onto it.
+    """
+    white, black = board[WHITE], board[BLACK]
+    best = (white, black)
+    best_g = 0
+    for g in _NON_IDENTITY:
+        t0, t1, t2 = _TABLES[g]
+        image_white = t0[white & CHUNK_MASK] | t1[white >> 7 & CHUNK_MASK] | t2[white >> 14]
+        if image_white > best[WHITE]:
+            continue
+        image = (image_white, t0[black & CHUNK_MASK] | t1[black >> 7 & CHUNK_MASK] | t2[black >> 14])
+        if image < best:
+            best = image
+            best_g = g
+    return best, best_g
+
+
+def canonical_set(bits):
+    """The smallest image of a single bitboard."""
+    return min(transform(bits, g) for g in range(len(AUTOMORPHISMS)))
+
+
+def canonical_key(board, side):
+    """
+    (key, g): the Zobrist key of the canonical form of `board` with `side`
+    to move, and the automorphism that maps `board` onto that form.  Every
+    image of a position gets the same key.  Pieces in hand, when the board
+    carries them, are part of the key.
+    """
+    image, g = canonical(board)
+    if len(board) > 2:
+        image += tuple(board[2:])
+    return zobrist_hash(image, side == BLACK), g
+
+
+def main():
+    print(f"{len(AUTOMORPHISMS)} automorphisms of the board:")
+    for p in AUTOMORPHISMS:
+        moved = " ".join(f"{i}->{p[i]}" for i in range(NUM_SQUARES) if p[i] != i)
+        print(f"  {moved or 'identity'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,393 @@
+"""
+Endgame tablebases: every midgame/endgame position with few pieces on the
+board, solved exactly by retrograde analysis.
+
+    python3 -m morris.tablebase build [--max-pieces N] [--wdl] [--dir DIR]
+    python3 -m morris.tablebase probe <board> [--black] [--dir DIR]
+
+The positions are grouped into classes by piece count, (White, Black) with
+both at least 3 and at most N pieces in total (default 6: the 3 v 3
+hopping endgame; 7 adds 4 v 3 and 3 v 4, and so on).  A side that is down
+to 2 pieces has lost, and a side to move without a legal move loses too.
+Captures always lead into a smaller class, so the classes are solved from
+the fewest pieces up, and within a class only captures read the smaller
+tables.
+
+Retrograde analysis works backwards from the lost positions: a position
+with a child that is lost for the opponent is won; a position all of whose
+children are won for the opponent is lost; whatever is never reached is
+a draw.  Taking the positions in order of their distance to the end of the
+game gives the shortest win and the longest loss.
+
+Positions are solved and stored up to the symmetries of the board
+(morris/symmetry.py), each once, in its canonical form.  Each class is a
+packed table (morris/packed.py), entry rank_symmetric(white, black) * 2 +
+side (morris/indexing.py), in one of two forms:
+
+    w<W>b<B>.dtm   distance to the end, in as few bits as the class needs:
+                   0 draw; d + 1 when the game ends after d plies of best
+                   play, won for the side to move when d is odd and lost
+                   when d is even (d = 0: it has no move)
+    w<W>b<B>.wdl   2 bits: DRAW, WIN or LOSS for the side to move
+
+The distance tables are what the searches want (a quick win scores higher
+than a slow one); build --wdl writes the four times smaller result-only
+tables instead.  Tables are mapped, not read (see morris/packed.py).
+"""
+
+import argparse
+import os
+import time
+
+from morris.board import ALL_SQUARES, BIT, BLACK, NEIGHBOR_MASKS, NUM_SQUARES, WHITE, from_string
+from morris.indexing import count_symmetric, rank_symmetric, unrank_symmetric
+from morris.mills import close_mill, mill_members
+from morris.movegen import iter_moves_game
+from morris.packed import PackedTable, width_for, write_packed
+from morris.position import format_move
+from morris.symmetry import canonical
+
+DEFAULT_DIRECTORY = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                 "tablebases")
+DEFAULT_MAX_PIECES = 6
+
+# Fewest pieces a side can play with; with fewer the game is over.
+MIN_PIECES = 3
+
+# Longest distance the solver can hold (one byte per entry while solving).
+MAX_PLIES = 254
+
+# Results in the .wdl tables, for the side to move.
+DRAW = 0
+WIN = 1
+LOSS = 2
+
+DISTANCE_SUFFIX = ".dtm"
+RESULT_SUFFIX = ".wdl"
+
+# Score of a won position from the point of view of the winner, less the
+# number of plies to the end, so that quicker wins score higher.  Equal to
+# the terminal scores of the static estimations.
+WIN_SCORE = 10000
+
+
+def table_size(white_count, black_count):
+    """Number of entries of the (white_count, black_count) class."""
+    return count_symmetric(white_count, black_count) * 2
+
+
+def index(board, side):
+    """Entry of (board, side to move), or of any of its images, in the table of its class."""
+    return rank_symmetric(board[WHITE], board[BLACK]) * 2 + side
+
+
+def table_name(white_count, black_count):
+    return f"w{white_count}b{black_count}"
+
+
+def classes(max_pieces):
+    """The (white_count, black_count) classes up to max_pieces, smallest first."""
+    return [(w, total - w)
+            for total in range(2 * MIN_PIECES, max_pieces + 1)
+            for w in range(MIN_PIECES, total - MIN_PIECES + 1)]
+
+
+# ---------- Generation ----------
+
+def _predecessors(board, side, mover_count):
+    """
+    Positions, with the opponent of `side` to move, from which a move
+    without a capture leads to `board` with `side` to move.
+    """
+    mover = 1 - side
+    own = board[mover]
+    other = board[side]
+    empty = ALL_SQUARES & ~(own | other)
+    # Closing a mill captures, unless every piece of `side` is in a mill.
+    mill_may_close = not other & ~mill_members(other)
+
+    pieces = own
+    while pieces:
+        dst = pieces & -pieces
+        pieces ^= dst
+        target = dst.bit_length() - 1
+        if not mill_may_close and close_mill(target, own):
+            continue
+        origins = empty if mover_count == MIN_PIECES else empty & NEIGHBOR_MASKS[target]
+        while origins:
+            src = origins & -origins
+            origins ^= src
+            before = own ^ dst ^ src
+            yield (before, other) if mover == WHITE else (other, before)
+
+
+def solve_class(white_count, black_count, tables, log=None):
+    """
+    Solve the (white_count, black_count) class by retrograde analysis.
+    `tables` maps the smaller classes, already solved, to their distance
+    tables.  Returns the distance table of this class as a bytearray.
+    """
+    size = table_size(white_count, black_count)
+    table = bytearray(size)
+    unresolved = bytearray(size)       # children not yet known to win for the opponent
+    no_loss = bytearray(size)          # a draw or a win is in reach: cannot lose
+    capture_loss = {}                  # plies of the longest capture that loses
+    buckets = [[] for _ in range(MAX_PLIES + 1)]
+    counts = (white_count, black_count)
+
+    # Pass 1: count the children inside the class and score the captures.
+    # Only the canonical form of each position is solved; the other
+    # indexes (see morris/indexing.py) are left at 0.
+    positions = 0
+    for number in range(count_symmetric(white_count, black_count)):
+        board = unrank_symmetric(number, white_count, black_count)
+        if canonical(board)[0] != board:
+            continue
+        positions += 2
+        for side in (WHITE, BLACK):
+            idx = number * 2 + side
+            quiet = set()
+            best_win = None
+            longest_loss = -1
+            moved = False
+            for origin, target, removed in iter_moves_game(board, side):
+                moved = True
+                own = board[side] ^ BIT[origin] ^ BIT[target]
+                if removed < 0:
+                    # Counted by child: symmetric moves lead to one entry.
+                    child = (own, board[1 - side]) if side == WHITE else (board[1 - side], own)
+                    quiet.add(index(child, 1 - side))
+                    continue
+                if counts[1 - side] - 1 < MIN_PIECES:
+                    best_win = 1               # the opponent is down to 2 pieces
+                    break
+                opponent = board[1 - side] ^ BIT[removed]
+                child = (own, opponent) if side == WHITE else (opponent, own)
+                child_counts = (child[WHITE].bit_count(), child[BLACK].bit_count())
+                value = tables[child_counts][index(child, 1 - side)]
+                if value == 0:
+                    no_loss[idx] = 1
+                elif value & 1:                # the opponent loses after value - 1 plies
+                    if best_win is None or value < best_win:
+                        best_win = value
+                else:                          # the opponent wins
+                    longest_loss = max(longest_loss, value)
+
+            if not moved:
+                buckets[0].append(idx)         # lost: no move
+                continue
+            if best_win is not None:
+                no_loss[idx] = 1
+                buckets[best_win].append(idx)
+            if longest_loss >= 0:
+                capture_loss[idx] = longest_loss
+            unresolved[idx] = len(quiet)
+            if not quiet and not no_loss[idx]:
+                # Every move is a losing capture.
+                buckets[longest_loss].append(idx)
+
+    # Pass 2: propagate from the end of the game backwards, nearest first.
+    # A bucket entry is a claim that the position is decided at that
+    # distance; the first claim to be taken out wins.
+    decided = 0
+    for plies in range(MAX_PLIES + 1):
+        bucket = buckets[plies]
+        while bucket:
+            idx = bucket.pop()
+            if table[idx]:
+                continue
+            table[idx] = plies + 1
+            decided += 1
+            if plies == MAX_PLIES:
+                raise ValueError(f"{table_name(*counts)}: distance too long for the table")
+
+            side = idx & 1
+            lost = not plies & 1
+            next_bucket = buckets[plies + 1]
+            board = unrank_symmetric(idx >> 1, white_count, black_count)
+            parents = {index(parent, 1 - side) for parent in _predecessors(board, side, counts[1 - side])}
+            for pidx in parents:
+                if table[pidx]:
+                    continue
+                if lost:                           # a move to a lost position wins
+                    no_loss[pidx] = 1
+                    next_bucket.append(pidx)
+                    continue
+                if no_loss[pidx]:
+                    continue
+                left = unresolved[pidx] - 1
+                unresolved[pidx] = left
+                if left == 0:
+                    buckets[max(plies + 1, capture_loss.get(pidx, 0))].append(pidx)
+
+    if log is not None:
+        log(f"{table_name(*counts)}: {positions} positions, {decided} decided, "
+            f"{positions - decided} drawn")
+    return table
+
+
+def results(table):
+    """The .wdl entries of a distance table."""
+    return bytes(DRAW if not value else WIN if value & 1 == 0 else LOSS for value in table)
+
+
+def build(max_pieces=DEFAULT_MAX_PIECES, directory=DEFAULT_DIRECTORY, wdl=False, log=print):
+    """
+    Solve every class up to max_pieces and write its table to `directory`,
+    distances or (wdl=True) results only.  Classes whose distance table
+    exists are not solved again; a result table cannot stand in for it.
+    """
+    os.makedirs(directory, exist_ok=True)
+    tables = {}
+    for counts in classes(max_pieces):
+        name = table_name(*counts)
+        distance_path = os.path.join(directory, name + DISTANCE_SUFFIX)
+        result_path = os.path.join(directory, name + RESULT_SUFFIX)
+        if os.path.exists(distance_path):
+            tables[counts] = PackedTable(distance_path)
+            log(f"{name}: already built")
+            if wdl and not os.path.exists(result_path):
+                write_packed(result_path, results(tables[counts]), 2)
+            continue
+
+        start = time.perf_counter()
+        table = solve_class(*counts, tables, log)
+        if wdl:
+            write_packed(result_path, results(table), 2)
+        else:
+            write_packed(distance_path, table, width_for(max(table)))
+        tables[counts] = table
+        log(f"{name}: {time.perf_counter() - start:.1f} s")
+
+
+# ---------- Probing ----------
+
+class Tablebase:
+    """
+    The tables found in `directory`, mapped; probe() answers for the
+    positions they cover and returns None for any other.  A class with
+    both forms is probed in its distance table.
+    """
+
+    def __init__(self, directory=DEFAULT_DIRECTORY):
+        self.directory = directory
+        self.tables = {}
+        self.distances = {}
+        names = sorted(os.listdir(directory)) if os.path.isdir(directory) else ()
+        for suffix in (RESULT_SUFFIX, DISTANCE_SUFFIX):
+            for name in names:
+                if not (name.startswith("w") and name.endswith(suffix)):
+                    continue
+                try:
+                    counts = tuple(int(n) for n in name[1:-len(suffix)].split("b"))
+                except ValueError:
+                    continue
+                if len(counts) != 2:
+                    continue
+                table = PackedTable(os.path.join(directory, name))
+                if len(table) != table_size(*counts):
+                    table.close()
+                    continue
+                if counts in self.tables:
+                    self.tables[counts].close()
+                self.tables[counts] = table
+                self.distances[counts] = suffix == DISTANCE_SUFFIX
+        self.max_pieces = max((sum(c) for c in self.tables), default=0)
+
+    def close(self):
+        for table in self.tables.values():
+            table.close()
+        self.tables.clear()
+
+    def probe(self, board, side):
+        """
+        (result, plies) of `board` with `side` to move: result is WIN, LOSS
+        or DRAW for the side to move, plies the distance to the end (None
+        from a result table or for a draw).  None when no table covers it.
+        """
+        white, black = board
+        if (white | black).bit_count() > self.max_pieces:
+            return None
+        counts = (white.bit_count(), black.bit_count())
+        table = self.tables.get(counts)
+        if table is None:
+            return None
+        value = table[rank_symmetric(white, black) * 2 + side]
+        if not self.distances[counts]:
+            return value, None
+        if value == 0:
+            return DRAW, None
+        plies = value - 1
+        return (WIN if plies & 1 else LOSS), plies
+
+    def score(self, board, side):
+        """
+        Exact score of `board` with `side` to move, from White's point of
+        view like the static estimations, or None when it is not covered.
+        """
+        entry = self.probe(board, side)
+        if entry is None:
+            return None
+        result, plies = entry
+        if result == DRAW:
+            return 0
+        score = WIN_SCORE - (plies or 0)
+        if result == LOSS:
+            score = -score
+        return score if side == WHITE else -score
+
+
+def describe(entry, side):
+    """Text form of a probe() result for `side` to move."""
+    if entry is None:
+        return "not covered"
+    result, plies = entry
+    if result == DRAW:
+        return "draw"
+    winner = side if result == WIN else 1 - side
+    text = f"{'White' if winner == WHITE else 'Black'} wins"
+    return text if plies is None else f"{text} in {plies} plies"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or probe the endgame tablebases.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build_parser = commands.add_parser("build", help="solve the classes up to --max-pieces")
+    build_parser.add_argument("--max-pieces", type=int, default=DEFAULT_MAX_PIECES,
+                              help=f"most pieces on the board in total (default {DEFAULT_MAX_PIECES})")
+    build_parser.add_argument("--wdl", action="store_true",
+                              help="write 2-bit win/draw/loss tables instead of distances")
+    build_parser.add_argument("--dir", default=DEFAULT_DIRECTORY)
+    probe_parser = commands.add_parser("probe", help="look up one position")
+    probe_parser.add_argument("board")
+    probe_parser.add_argument("--black", action="store_true", help="Black is to move")
+    probe_parser.add_argument("--dir", default=DEFAULT_DIRECTORY)
+    args = parser.parse_args()
+
+    if args.command == "build":
+        if args.max_pieces < 2 * MIN_PIECES:
+            parser.error(f"--max-pieces must be at least {2 * MIN_PIECES}")
+        build(args.max_pieces, args.dir, args.wdl)
+        return
+
+    if len(args.board) != NUM_SQUARES or set(args.board) - set("WBx"):
+        parser.error("the board must be 21 characters of 'W', 'B' and 'x'")
+    board = from_string(args.board)
+    side = BLACK if args.black else WHITE
+    tablebase = Tablebase(args.dir)
+    print(f"{args.board}: {describe(tablebase.probe(board, side), side)}")
+    for move in iter_moves_game(board, side):
+        child = list(board)
+        origin, target, removed = move
+        child[side] ^= BIT[origin] ^ BIT[target]
+        if removed >= 0:
+            child[1 - side] ^= BIT[removed]
+        if child[1 - side].bit_count() < MIN_PIECES:
+            result = "wins at once"
+        else:
+            result = describe(tablebase.probe(tuple(child), 1 - side), 1 - side)
+        print(f"  {format_move(move)}: {result}")
+
+
+if __name__ == "__main__":
+    main()
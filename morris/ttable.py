@@ -0,0 +1,156 @@
+"""
+Zobrist hashing and a fixed-size transposition table for the alpha–beta
+searches.
+
+The table is an array of slots indexed by the low bits of the Zobrist key,
+so its memory use is capped by the number of slots chosen up front.  Each
+slot holds a single entry:
+
+    (key, depth, flag, value, best_move, generation)
+
+flag tells how `value` relates to the true minimax value of the position:
+EXACT (searched inside the window), LOWER (a β-cut happened, the value is at
+least `value`) or UPPER (every child failed low, the value is at most
+`value`).
+"""
+
+import random
+
+from morris.board import BLACK, NUM_SQUARES, PIECES_PER_SIDE, WHITE
+
+EXACT = 0
+LOWER = 1
+UPPER = 2
+
+DEFAULT_TT_ENTRIES = 1 << 20
+
+# Replacement policies (see TranspositionTable)
+REPLACEMENTS = ('depth', 'always')
+
+# Fixed seed so every process (and every run) hashes positions identically.
+_rng = random.Random(0x5EED_2B0A)
+ZOBRIST_WHITE = tuple(_rng.getrandbits(64) for _ in range(NUM_SQUARES))
+ZOBRIST_BLACK = tuple(_rng.getrandbits(64) for _ in range(NUM_SQUARES))
+ZOBRIST_BLACK_TO_MOVE = _rng.getrandbits(64)
+# ZOBRIST_IN_HAND[side][n]: `side` has n pieces left to place.
+ZOBRIST_IN_HAND = tuple(tuple(_rng.getrandbits(64) for _ in range(PIECES_PER_SIDE + 1))
+                        for _ in (WHITE, BLACK))
+
+# Hashing a bitboard one square at a time is too slow for the search, so the
+# 21 squares are split into three 7-bit chunks with a 128-entry table each:
+# a full hash is then six table lookups.
+CHUNK_BITS = 7
+CHUNK_MASK = (1 << CHUNK_BITS) - 1
+
+
+def chunk_tables(keys):
+    """
+    For each 7-bit chunk of a bitboard, the table of the XOR of keys[square]
+    over the squares of every value of the chunk.  Any function of a
+    bitboard that XORs per-square values (a hash, or with disjoint bits a
+    permutation of the squares) is then three lookups.
+    """
+    tables = []
+    for chunk in range(NUM_SQUARES // CHUNK_BITS):
+        table = []
+        for bits in range(1 << CHUNK_BITS):
+            h = 0
+            for k in range(CHUNK_BITS):
+                if bits >> k & 1:
+                    h ^= keys[chunk * CHUNK_BITS + k]
+            table.append(h)
+        tables.append(tuple(table))
+    return tables
+
+
+_W0, _W1, _W2 = chunk_tables(ZOBRIST_WHITE)
+_B0, _B1, _B2 = chunk_tables(ZOBRIST_BLACK)
+
+
+def zobrist_hash(board, black_to_move=False):
+    """
+    Return the 64-bit Zobrist key of a (white, black) position: the XOR of
+    the random key of every occupied (square, color), plus the side-to-move
+    key when Black is to move, plus the keys of the pieces in hand when the
+    board carries them.
+    """
+    white, black = board[WHITE], board[BLACK]
+    h = (_W0[white & CHUNK_MASK] ^ _W1[white >> 7 & CHUNK_MASK] ^ _W2[white >> 14]
+         ^ _B0[black & CHUNK_MASK] ^ _B1[black >> 7 & CHUNK_MASK] ^ _B2[black >> 14])
+    if black_to_move:
+        h ^= ZOBRIST_BLACK_TO_MOVE
+    if len(board) > 2:
+        h ^= ZOBRIST_IN_HAND[WHITE][board[2]] ^ ZOBRIST_IN_HAND[BLACK][board[3]]
+    return h
+
+
+class TranspositionTable:
+    """
+    Fixed-size transposition table.
+
+    max_entries caps the number of slots (rounded down to a power of two).
+    replacement selects what happens when a slot already holds a different
+    position:
+      - 'depth':  keep the deeper entry, unless it is left over from an
+                  earlier search (new_search() ages the table)
+      - 'always': the newest entry always wins
+    """
+
+    def __init__(self, max_entries=DEFAULT_TT_ENTRIES, replacement='depth'):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        if replacement not in REPLACEMENTS:
+            raise ValueError("replacement must be 'depth' or 'always'")
+
+        size = 1 << (max_entries.bit_length() - 1)
+        self.size = size
+        self.mask = size - 1
+        self.replacement = replacement
+        self.slots = [None] * size
+        self.generation = 0
+
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+
+    def new_search(self):
+        """Age the table so entries from earlier searches are replaced first."""
+        self.generation += 1
+
+    def clear(self):
+        self.slots = [None] * self.size
+        self.generation = 0
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+
+    def probe(self, key):
+        """
+        Return the entry stored for `key`, or None.
+        Every call counts as a probe; a matching key counts as a hit.
+        """
+        self.probes += 1
+        entry = self.slots[key & self.mask]
+        if entry is not None and entry[0] == key:
+            self.hits += 1
+            return entry
+        return None
+
+    def store(self, key, depth, flag, value, best_move):
+        index = key & self.mask
+        old = self.slots[index]
+
+        if (old is not None and self.replacement == 'depth'
+                and old[0] != key
+                and old[5] == self.generation
+                and old[1] > depth):
+            return
+
+        self.slots[index] = (key, depth, flag, value, best_move, self.generation)
+        self.stores += 1
+
+    def hit_rate(self):
+        """Fraction of probes that found their position in the table."""
+        if self.probes == 0:
+            return 0.0
+        return self.hits / self.probes